@@ -2,24 +2,33 @@
 astrorank - Image Ranking GUI Application
 """
 
+import os
 import sys
 import signal
 import argparse
+import functools
+import threading
 import webbrowser
 from pathlib import Path
+from collections import OrderedDict
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
-    QLabel, QLineEdit, QPushButton, QScrollArea, QTableWidget, QTableWidgetItem,
+    QLabel, QLineEdit, QPushButton, QScrollArea, QTableView,
     QHeaderView, QMessageBox, QDialog, QTextEdit, QInputDialog, QProgressBar, QSlider,
     QSplitter, QPlainTextEdit
 )
-from PyQt5.QtGui import QPixmap, QColor, QFont, QIcon, QTransform, QImage
-from PyQt5.QtCore import Qt, QSize, QTimer, QThread, pyqtSignal, QBuffer
+from PyQt5.QtGui import (
+    QPixmap, QPixmapCache, QColor, QBrush, QFont, QIcon, QTransform, QImage, QImageReader, QTextDocument
+)
+from PyQt5.QtCore import (
+    Qt, QSize, QTimer, QThread, pyqtSignal, QBuffer, QAbstractTableModel, QModelIndex,
+    QObject, QRunnable, QThreadPool
+)
 
 from astrorank.utils import (
-    get_jpg_files, load_rankings, save_rankings,
-    find_next_unranked, find_first_unranked, is_valid_rank,
+    get_jpg_files, load_rankings, save_rankings, open_journal, append_rank,
+    UnrankedIndex, is_valid_rank,
     parse_radec_from_filename, load_config, download_secondary_image,
     parse_key_string, string_to_qt_key, parse_rank_config, get_rank_range,
     find_file_in_secondary_dir
@@ -27,6 +36,51 @@ from astrorank.utils import (
 from astrorank.ui_utils import get_astrorank_icon
 
 
+# Idle time (ms) after the last change before the rankings and comments files are rewritten;
+# individual ranks are journaled immediately, so this only bounds how stale the full files get
+SAVE_DELAY_MS = 2000
+
+# Memory (KB) for decoded images kept in QPixmapCache so revisiting an image skips the JPEG decode
+PIXMAP_CACHE_LIMIT_KB = 256 * 1024
+
+# Neighbors (relative to the current image) decoded ahead of time, in priority order
+PREFETCH_OFFSETS = (1, 2, -1)
+
+# Quiet time (ms) after the last zoom step before the fast draft is replaced by a smooth render
+ZOOM_SETTLE_MS = 40
+
+# Widths images are decoded at (libjpeg scales during the DCT, so a smaller width decodes
+# fewer pixels); an image is decoded at the smallest width covering its display width.
+# The last one matches the largest the zoomed image container can grow
+DECODE_WIDTHS = (600, 1000, 1400)
+
+# Table brushes, built once and indexed by dark mode (False = light, True = dark)
+ROW_BRUSHES = (QBrush(QColor(255, 255, 255)), QBrush(QColor(30, 30, 30)))
+HIGHLIGHT_BRUSHES = (QBrush(QColor(173, 216, 230)), QBrush(QColor(70, 120, 180)))
+TEXT_BRUSHES = (QBrush(QColor(0, 0, 0)), QBrush(QColor(255, 255, 255)))
+
+# Per-column text alignment of the table (Filename, Rank, Ranked?, Comments, secondary image);
+# None keeps the default alignment
+COLUMN_ALIGNMENTS = (None, Qt.AlignCenter, Qt.AlignCenter, None, Qt.AlignCenter)
+
+# Configurable key actions in priority order: if one key is bound to several actions, the first wins
+KEY_ACTIONS = (
+    'clear_input', 'quit', 'clear_rank', 'fit_image', 'reset_container', 'toggle_helper', 'toggle_list',
+    'toggle_dark_mode', 'save', 'view_rankings', 'comment', 'wise_toggle', 'legacy_survey', 'ned_search',
+    'toggle_secondary_dir', 'zoom_in', 'zoom_out', 'brightness_increase', 'brightness_decrease',
+    'contrast_increase', 'contrast_decrease', 'reset_brightness_contrast', 'submit_and_next',
+    'first_image', 'skip_to_next_unranked', 'previous', 'next'
+)
+
+# Roles RankingsModel provides; every other role Qt asks for while painting is answered immediately
+TABLE_ROLES = frozenset((Qt.DisplayRole, Qt.TextAlignmentRole, Qt.BackgroundRole, Qt.ForegroundRole, Qt.DecorationRole))
+
+# Table thumbnails (optional, see the "thumbnails" config section): default size in pixels, and
+# how many are kept in memory (about 9 MB at the default size)
+DEFAULT_THUMBNAIL_SIZE = 48
+THUMBNAIL_CACHE_SIZE = 1000
+
+
 class DownloadWorker(QThread):
     """Worker thread for downloading secondary images without blocking UI"""
     progress = pyqtSignal(int)
@@ -53,6 +107,108 @@ class DownloadWorker(QThread):
             self.error.emit(f"Download error: {str(e)}")
 
 
+class ScanWorker(QThread):
+    """Worker thread for listing the images and loading saved rankings without blocking UI"""
+    finished = pyqtSignal(object, object)  # Emits (jpg_files, rankings)
+    error = pyqtSignal(str)  # Emits error message
+    
+    def __init__(self, image_dir, output_file):
+        super().__init__()
+        self.image_dir = image_dir
+        self.output_file = output_file
+    
+    def run(self):
+        """List the directory (slow on network or sleeping drives) and read the rankings file"""
+        try:
+            jpg_files = get_jpg_files(self.image_dir)
+            rankings = load_rankings(self.output_file) if jpg_files else {}
+            self.finished.emit(jpg_files, rankings)
+        except Exception as e:
+            self.error.emit(f"Could not read {self.image_dir}: {str(e)}")
+
+
+def _read_image(path, max_width=DECODE_WIDTHS[-1]):
+    """
+    Decode an image, downscaling during the decode if it is wider than max_width
+    
+    Args:
+        path: Path to the image file
+        max_width: Maximum width in pixels of the decoded image
+        
+    Returns:
+        QImage (null if the file could not be decoded)
+    """
+    # Ask the kernel to start reading the whole file ahead, so the decoder is fed from
+    # the page cache rather than waiting on one small read at a time (POSIX only)
+    if hasattr(os, "posix_fadvise"):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+    
+    reader = QImageReader(path)
+    size = reader.size()
+    if size.isValid() and size.width() > max_width:
+        reader.setScaledSize(QSize(max_width, max(1, round(size.height() * max_width / size.width()))))
+    return reader.read()
+
+
+@functools.lru_cache(maxsize=None)
+def _ui_font(scale=1.0, point_size=None):
+    """
+    Shared font for a widget: the application default scaled by `scale`, or a fixed point size
+    
+    Fonts are built on first use (after the QApplication exists) and reused by every widget.
+    
+    Args:
+        scale: Factor applied to the default point size
+        point_size: Fixed point size; overrides scale
+        
+    Returns:
+        QFont
+    """
+    font = QFont()
+    font.setPointSize(point_size if point_size is not None else int(font.pointSize() * scale))
+    return font
+
+
+class ImageDecodeSignals(QObject):
+    """Signals for ImageDecodeTask (QRunnable is not a QObject)"""
+    finished = pyqtSignal(object, object)  # Emits (cache key, QImage); the QImage is null on failure
+
+
+class ImageDecodeTask(QRunnable):
+    """Decode an image file to a QImage on a thread pool (QImage, unlike QPixmap, is thread-safe)"""
+    
+    def __init__(self, path, cache_key, max_width):
+        super().__init__()
+        self.path = path
+        self.cache_key = cache_key
+        self.max_width = max_width
+        self.signals = ImageDecodeSignals()
+    
+    def run(self):
+        """Decode the image and hand it back to the GUI thread"""
+        self.signals.finished.emit(self.cache_key, _read_image(self.path, self.max_width))
+
+
+def _decode_width(width):
+    """Smallest of DECODE_WIDTHS that covers a display width (the largest if none does)"""
+    return next((w for w in DECODE_WIDTHS if w >= width), DECODE_WIDTHS[-1])
+
+
+def _pixmap_cache_key(path, max_width):
+    """QPixmapCache key for a decoded image: its path, modification time and decode width, or None if unreadable"""
+    try:
+        return f"{path}|{os.stat(path).st_mtime_ns}|{max_width}"
+    except OSError:
+        return None
+
+
 class NavigationAwareLineEdit(QLineEdit):
     """QLineEdit that forwards arrow keys and other navigation keys to parent window"""
     
@@ -109,28 +265,200 @@ class CommentDialog(QDialog):
         return self.text_edit.text().strip()
 
 
+class RankingsModel(QAbstractTableModel):
+    """Table model for the image list; cells are computed on demand from the GUI's data"""
+    
+    def __init__(self, jpg_files, rankings, comments, secondary_images, secondary_name=None, parent=None):
+        """
+        Args:
+            jpg_files: List of image filenames (one row each)
+            rankings: Dict mapping filename to rank, shared with the GUI
+            comments: Dict mapping filename to comment, shared with the GUI
+            secondary_images: Dict mapping filename to downloaded secondary image path, shared with the GUI
+            secondary_name: Survey name for the secondary image column, or None to hide the column
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.jpg_files = jpg_files
+        self.rankings = rankings
+        self.comments = comments
+        self.secondary_images = secondary_images
+        self.headers = ["Filename", "Rank", "Ranked?", "Comments"]
+        if secondary_name is not None:
+            self.headers.append(f"{secondary_name}?")
+        self.current_row = 0  # Highlighted row
+        self.dark_mode = False
+        self.image_paths = []  # Paths parallel to jpg_files, used for thumbnails
+        self.thumbnail_size = 0  # 0 = no thumbnails (see enable_thumbnails)
+        self._thumbnail_pool = None
+        self._thumbnails = OrderedDict()  # Filename -> thumbnail QPixmap, least recently used first
+        self._thumbnail_tasks = {}  # In-flight thumbnail decodes by filename (keeps their signals alive)
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.jpg_files)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in TABLE_ROLES or not index.isValid():
+            return None
+        column = index.column()
+        
+        if role == Qt.DisplayRole:
+            filename = self.jpg_files[index.row()]
+            if column == 0:
+                return filename
+            if column == 1:
+                rank = self.rankings.get(filename)
+                return "" if rank is None else str(rank)
+            if column == 2:
+                return "✓" if filename in self.rankings else ""
+            if column == 3:
+                # No truncation - columns are resizable
+                return self.comments.get(filename, "")
+            if column == 4:
+                return "✓" if filename in self.secondary_images else ""
+        elif role == Qt.TextAlignmentRole:
+            return COLUMN_ALIGNMENTS[column]
+        elif role == Qt.BackgroundRole:
+            # Highlight current row
+            if index.row() == self.current_row:
+                return HIGHLIGHT_BRUSHES[self.dark_mode]
+            return ROW_BRUSHES[self.dark_mode]
+        elif role == Qt.ForegroundRole:
+            return TEXT_BRUSHES[self.dark_mode]
+        elif role == Qt.DecorationRole:
+            if column == 0 and self.thumbnail_size:
+                return self._thumbnail(index.row())
+        return None
+    
+    def enable_thumbnails(self, size):
+        """
+        Show a thumbnail next to each filename, decoded on demand as rows become visible
+        
+        Args:
+            size: Thumbnail width in pixels
+        """
+        self.thumbnail_size = size
+        # Own pool, so thumbnails never compete with decoding and prefetching the displayed images
+        self._thumbnail_pool = QThreadPool(self)
+        self._thumbnail_pool.setMaxThreadCount(1)
+    
+    def drop_thumbnail_requests(self, first_row, last_row):
+        """Cancel queued thumbnail decodes for rows outside first_row..last_row (scrolled out of view)"""
+        for filename, task in list(self._thumbnail_tasks.items()):
+            row = task.cache_key[0]
+            if not first_row <= row <= last_row and self._thumbnail_pool.tryTake(task):
+                del self._thumbnail_tasks[filename]
+    
+    def _thumbnail(self, row):
+        """Thumbnail for a row, or None while it is being decoded (the row is repainted when it is ready)"""
+        filename = self.jpg_files[row]
+        pixmap = self._thumbnails.get(filename)
+        if pixmap is not None:
+            self._thumbnails.move_to_end(filename)
+            return None if pixmap.isNull() else pixmap
+        
+        if filename not in self._thumbnail_tasks and row < len(self.image_paths):
+            # libjpeg decodes straight at thumbnail size, so this never touches the full-resolution image
+            task = ImageDecodeTask(self.image_paths[row], (row, filename), self.thumbnail_size)
+            task.signals.finished.connect(self._on_thumbnail_decoded)
+            task.setAutoDelete(False)  # Kept alive by _thumbnail_tasks, so drop_thumbnail_requests can always tryTake it
+            self._thumbnail_tasks[filename] = task
+            self._thumbnail_pool.start(task)
+        return None
+    
+    def _on_thumbnail_decoded(self, key, image):
+        """Cache a decoded thumbnail (a null one marks a failed decode) and repaint its row"""
+        row, filename = key
+        self._thumbnail_tasks.pop(filename, None)
+        self._thumbnails[filename] = QPixmap.fromImage(image)
+        if len(self._thumbnails) > THUMBNAIL_CACHE_SIZE:
+            self._thumbnails.popitem(last=False)
+        if row < len(self.jpg_files) and self.jpg_files[row] == filename:
+            self.refresh_row(row, [Qt.DecorationRole])
+    
+    def refresh_row(self, row, roles=None):
+        """Repaint one row from the underlying data (optionally only the given roles)"""
+        if 0 <= row < len(self.jpg_files):
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.headers) - 1), roles or [])
+    
+    def set_rows(self, jpg_files, image_paths, rankings, comments):
+        """Replace all rows, e.g. once the image directory has been scanned"""
+        self.beginResetModel()
+        self.jpg_files = jpg_files
+        self.image_paths = image_paths
+        self.rankings = rankings
+        self.comments = comments
+        self.endResetModel()
+    
+    def set_current_row(self, row):
+        """Move the highlight to row, repainting only the old and new current rows"""
+        old_row = self.current_row
+        self.current_row = row
+        if old_row != row:
+            self.refresh_row(old_row, [Qt.BackgroundRole])
+        self.refresh_row(row, [Qt.BackgroundRole])
+    
+    def set_dark_mode(self, dark_mode):
+        """Switch row colors between dark and light mode"""
+        self.dark_mode = dark_mode
+        if self.jpg_files:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.jpg_files) - 1, len(self.headers) - 1),
+                                  [Qt.BackgroundRole, Qt.ForegroundRole])
+
+
 class AstrorankGUI(QMainWindow):
     def __init__(self, image_dir, output_file="rankings.txt", config_file="config.json"):
         super().__init__()
         
         self.image_dir = Path(image_dir)
         self.output_file = Path(output_file)
+        self._output_file_str = str(self.output_file)  # Reused by every save instead of re-converting the Path
         self.previous_index = -1  # Track previous index for efficient updates
-        self.save_counter = 0  # Batch saves every N rankings
-        self.table_initialized = False  # Track if table has been populated
+        self._dirty = False  # Rankings or comments changed since the files were last rewritten
+        self._journal = None  # Rankings journal, kept open between rank changes (see _journal_file)
+        self._close_save_thread = None  # Final save started by closeEvent, joined when the application quits
+        self._close_requested = False  # Window was closed while the startup scan was running (see closeEvent)
+        self._save_timer = QTimer(self)  # Debounces full rewrites of the rankings/comments files
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self._flush_save)
         self.list_visible = True  # Track list visibility state
         self.zoom_level = 1.0  # Track zoom level for single image view
         self.dual_view_zoom = 1.0  # Track zoom level for dual-view images
+        self._zoom_timer = QTimer(self)  # Coalesces rapid zoom steps into one smooth re-render
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(ZOOM_SETTLE_MS)
+        self._zoom_timer.timeout.connect(self._update_displayed_image)
         self.helper_visible = False  # Track helper window visibility
         self.helper_window = None  # Reference to helper dialog
         self.skip_scroll = False  # Skip scroll-to-center on click navigation
+        self._scroll_pending = False  # A scroll to the current row is queued (see set_current_row)
         self.dark_mode = False  # Track dark mode state
         self.original_container_width = 680  # Original container width for reset
         self.original_container_height = 680  # Original container height for reset
+        QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT_KB)  # Decoded images, keyed by _pixmap_cache_key
+        self._decode_tasks = {}  # In-flight background decodes by cache key (keeps their signals alive)
+        self._awaited_image_path = None  # Image the single view is waiting on, if its decode is in flight
+        # Python tasks must never run on Qt's global pool: smooth scaling on the GUI thread (which holds
+        # the GIL) splits its work onto that pool and would wait forever behind a task needing the GIL
+        self._decode_pool = QThreadPool(self)  # Decodes of the image being displayed
+        self._prefetch_pool = QThreadPool(self)  # Separate small pool so prefetching never starves the displayed image
+        self._prefetch_pool.setMaxThreadCount(2)
         
         # Brightness and contrast adjustment tracking
         self.brightness_multiplier = 1.0  # 1.0 = normal, > 1.0 = brighter, < 1.0 = darker
         self.contrast_multiplier = 1.0    # 1.0 = normal, > 1.0 = more contrast, < 1.0 = less contrast
+        self._adjustment = (1.0, 1.0)  # (brightness, contrast) the pixmaps in _adjusted_pixmaps were made with
+        self._adjusted_pixmaps = {}  # Adjusted copies of decoded pixmaps by QPixmap.cacheKey, reused across zoom steps
         
         # Secondary image download functionality (configurable survey)
         self.config = load_config(config_file)
@@ -150,6 +478,7 @@ class AstrorankGUI(QMainWindow):
         self.secondary_dir_enabled = secondary_dir_config.get("enabled", False)
         self.secondary_dir_path = Path(secondary_dir_config.get("path", "")) if secondary_dir_config.get("path") else None
         self.use_secondary_dir = False  # Toggle state for which directory to display
+        self._secondary_paths = {}  # Filename -> matching secondary directory image (or None), resolved once per toggle
         
         self.secondary_name = secondary_config.get("name", "Secondary")
         self.secondary_output_dir = Path(image_dir) / self.secondary_name.lower()
@@ -168,25 +497,62 @@ class AstrorankGUI(QMainWindow):
         self.rank_map = parse_rank_config(rank_config)  # Maps Qt key enums to rank values
         self.min_rank, self.max_rank = get_rank_range(rank_config)  # Get valid range
         
-        # Load image files and rankings
-        self.jpg_files = get_jpg_files(str(self.image_dir))
-        if not self.jpg_files:
-            raise ValueError(f"No .jpg files found in {self.image_dir}")
-        
-        self.rankings = load_rankings(str(self.output_file))
+        # Image files and rankings are filled in by _on_scan_finished once the background scan is done
+        self.jpg_files = []
+        self._image_paths = []  # Parallel to jpg_files
+        self.rankings = {}
+        self.unranked = UnrankedIndex(self.jpg_files, self.rankings)  # Kept in sync with self.rankings
         self.comments = {}  # Store comments for images
-        self._load_comments()  # Load comments from file
-        
-        # Start at first image
         self.current_index = 0
         
         self.init_ui()
         self.apply_light_stylesheet()  # Apply light mode by default on startup
+        
+        # Scan the directory off the GUI thread so the window paints (and can be closed) right away
+        self.centralWidget().setEnabled(False)
+        self.image_label.setText(f"Scanning {self.image_dir}...")
+        self.scan_worker = ScanWorker(str(self.image_dir), self._output_file_str)
+        self.scan_worker.finished.connect(self._on_scan_finished)
+        self.scan_worker.error.connect(self._on_scan_error)
+        self.scan_worker.start()
+    
+    def _on_scan_finished(self, jpg_files, rankings):
+        """Show the first unranked image once the image directory and rankings have been loaded"""
+        if self._close_requested:
+            # Closed during the scan; nothing was loaded, so there is nothing to save. This signal is
+            # emitted from inside run(), so let the thread end (briefly) or closeEvent would defer again
+            self.scan_worker.wait()
+            self.close()
+            return
+        if not jpg_files:
+            self._on_scan_error(f"No .jpg/.jpeg files found in {self.image_dir}")
+            return
+        
+        self.jpg_files = jpg_files
+        image_dir_str = str(self.image_dir)
+        self._image_paths = [os.path.join(image_dir_str, filename) for filename in jpg_files]
+        self.rankings = rankings
+        self.unranked = UnrankedIndex(self.jpg_files, self.rankings)
+        self._load_comments()  # Load comments from file
+        self.table_model.set_rows(self.jpg_files, self._image_paths, self.rankings, self.comments)
+        
+        # Start at the first unranked image (the first image for a new session), straight from the index
+        self.current_index = self.unranked.first_unranked()
+        
+        self.centralWidget().setEnabled(True)
         self.display_image()
     
+    def _on_scan_error(self, error_msg):
+        """Report a failed or empty scan and quit, as there is nothing to rank"""
+        print(f"Error: {error_msg}")
+        if self._close_requested:
+            self.scan_worker.wait()  # Emitted from inside run(); see _on_scan_finished
+            self.close()
+        QApplication.instance().exit(1)
+    
     def init_ui(self):
         """Initialize the user interface"""
-        self.setWindowTitle("astrorank - Image Ranking Tool")
+        self.setWindowTitle("🔭 AstroRank (v1.3)")
         
         # Set application icon
         icon = get_astrorank_icon()
@@ -203,8 +569,7 @@ class AstrorankGUI(QMainWindow):
         top_bar = QHBoxLayout()
         top_bar.setContentsMargins(0, 0, 0, 0)
         
-        large_font = QFont()
-        large_font.setPointSize(int(large_font.pointSize() * 1.5))
+        large_font = _ui_font(1.5)
         
         self.save_button = QPushButton("Save")
         self.save_button.setFont(large_font)
@@ -252,9 +617,7 @@ class AstrorankGUI(QMainWindow):
         
         # Image filename and ranking info (shown above both single and dual views)
         self.image_info_label = QLabel()
-        info_font = QFont()
-        info_font.setPointSize(int(info_font.pointSize() * 1.5))
-        self.image_info_label.setFont(info_font)
+        self.image_info_label.setFont(_ui_font(1.5))
         self.image_info_label.setAlignment(Qt.AlignLeft)
         self.image_info_label.setTextFormat(Qt.RichText)
         self.image_info_label.setMaximumHeight(30)
@@ -327,8 +690,7 @@ class AstrorankGUI(QMainWindow):
         zoom_layout.setContentsMargins(0, 0, 0, 0)
         zoom_layout.setSpacing(2)
         
-        small_font = QFont()
-        small_font.setPointSize(int(small_font.pointSize() * 1.2))
+        small_font = _ui_font(1.2)
         
         self.zoom_in_button = QPushButton("+")
         self.zoom_in_button.setFont(small_font)
@@ -380,9 +742,7 @@ class AstrorankGUI(QMainWindow):
         
         # Brightness label
         self.brightness_label = QLabel("Brightness: 1.0")
-        brightness_label_font = QFont()
-        brightness_label_font.setPointSize(7)
-        self.brightness_label.setFont(brightness_label_font)
+        self.brightness_label.setFont(_ui_font(point_size=7))
         self.brightness_label.setAlignment(Qt.AlignCenter)
         brightness_slider_layout.addWidget(self.brightness_label)
         
@@ -404,9 +764,7 @@ class AstrorankGUI(QMainWindow):
         
         # Contrast label
         self.contrast_label = QLabel("Contrast: 1.0")
-        contrast_label_font = QFont()
-        contrast_label_font.setPointSize(7)
-        self.contrast_label.setFont(contrast_label_font)
+        self.contrast_label.setFont(_ui_font(point_size=7))
         self.contrast_label.setAlignment(Qt.AlignCenter)
         contrast_slider_layout.addWidget(self.contrast_label)
         
@@ -452,9 +810,8 @@ class AstrorankGUI(QMainWindow):
         control_layout = QHBoxLayout()
         control_layout.setSpacing(3)
         
-        # Create larger font (1.5x default)
-        large_font = QFont()
-        large_font.setPointSize(int(large_font.pointSize() * 1.5))
+        # Larger font (1.5x default)
+        large_font = _ui_font(1.5)
         
         # Create rank label with dynamic range
         rank_label = QLabel(f"Rank ({self.min_rank}-{self.max_rank}):")
@@ -502,17 +859,15 @@ class AstrorankGUI(QMainWindow):
         table_layout.setContentsMargins(0, 0, 0, 0)  # No margins
         table_layout.setSpacing(0)  # No spacing
         
-        self.table = QTableWidget()
-        # Set column count based on whether secondary download is enabled
-        num_columns = 5 if self.secondary_enabled else 4
-        self.table.setColumnCount(num_columns)
-        
-        # Build header labels conditionally
-        headers = ["Filename", "Rank", "Ranked?", "Comments"]
-        if self.secondary_enabled:
-            secondary_header = f"{self.secondary_name}?"
-            headers.append(secondary_header)
-        self.table.setHorizontalHeaderLabels(headers)
+        # The model reads rankings/comments lazily, so only visible rows are ever rendered
+        # Secondary image column only if secondary download is enabled
+        self.table_model = RankingsModel(
+            self.jpg_files, self.rankings, self.comments, self.secondary_images,
+            self.secondary_name if self.secondary_enabled else None, self
+        )
+        self.table_model.current_row = self.current_index
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
         
         # Set all columns resizable independently
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)  # Filename resizable
@@ -529,18 +884,26 @@ class AstrorankGUI(QMainWindow):
         self.table.setColumnWidth(3, 110)  # Comments column
         if self.secondary_enabled:
             self.table.setColumnWidth(4, 60)   # Secondary? column
-        self.table.setRowCount(len(self.jpg_files))
-        self.table.itemClicked.connect(self.on_table_click)
+        
+        # All rows have the same height, so Qt never needs to measure row contents
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        
+        # Optional thumbnails next to the filenames, decoded in the background as rows scroll into view
+        thumbnails_config = self.config.get("thumbnails", {})
+        if thumbnails_config.get("enabled", False):
+            thumbnail_size = thumbnails_config.get("size", DEFAULT_THUMBNAIL_SIZE)
+            self.table_model.enable_thumbnails(thumbnail_size)
+            self.table.setIconSize(QSize(thumbnail_size, thumbnail_size))
+            self.table.verticalHeader().setDefaultSectionSize(thumbnail_size + 4)
+            self.table.verticalScrollBar().valueChanged.connect(self._drop_hidden_thumbnail_requests)
+        self.table.clicked.connect(self.on_table_click)
         self.table.setHorizontalScrollMode(1)  # ScrollPerPixel
-        self.table.setSelectionMode(QTableWidget.NoSelection)  # Disable default selection
-        self.table.itemDoubleClicked.connect(self.on_table_double_click)
+        self.table.setSelectionMode(QTableView.NoSelection)  # Disable default selection
+        self.table.doubleClicked.connect(self.on_table_double_click)
         
         table_layout.addWidget(self.table)
         table_container.setLayout(table_layout)
         
-        # Populate table
-        self.update_table()
-        
         # Store references to layouts and widgets for toggling
         self.left_layout = left_layout
         self.list_widget = self.table
@@ -568,13 +931,19 @@ class AstrorankGUI(QMainWindow):
         main_container.addLayout(self.main_layout)
         main_widget.setLayout(main_container)
         
-        # Set focus to main window so arrow keys work for navigation
+        # Only the main window takes keyboard focus, so clicking a button, slider, the table or the
+        # rank field never moves it and arrow keys always reach keyPressEvent; the rank field is
+        # filled by the rank keys (see _check_rank_key)
+        for widget in main_widget.findChildren(QWidget):
+            widget.setFocusPolicy(Qt.NoFocus)
+        self.setFocusPolicy(Qt.StrongFocus)
         self.setFocus()
     
     def display_image(self):
         """Display the current image"""
         current_file = self.jpg_files[self.current_index]
-        image_path = self.image_dir / current_file
+        self._zoom_timer.stop()  # The new image is rendered smoothly right away
+        self._adjusted_pixmaps.clear()
         
         # Reset brightness and contrast to original values when changing images
         self.brightness_multiplier = 1.0
@@ -597,21 +966,21 @@ class AstrorankGUI(QMainWindow):
         
         if current_file in self.rankings:
             rank = self.rankings[current_file]
-            self.image_info_label.setText(f"<table style='width: 100%;'><tr><td style='padding-right: 10px;'>{current_file}</td><td style='width: 100%;'></td><td align='right'>(Rank: {rank}) [{current_index_display}/{total_images}]</td></tr></table>")
+            info_text = f"<table style='width: 100%;'><tr><td style='padding-right: 10px;'>{current_file}</td><td style='width: 100%;'></td><td align='right'>(Rank: {rank}) [{current_index_display}/{total_images}]</td></tr></table>"
         else:
-            self.image_info_label.setText(f"<table style='width: 100%;'><tr><td style='padding-right: 10px;'>{current_file}</td><td style='width: 100%;'></td><td align='right'>[{current_index_display}/{total_images}]</td></tr></table>")
+            info_text = f"<table style='width: 100%;'><tr><td style='padding-right: 10px;'>{current_file}</td><td style='width: 100%;'></td><td align='right'>[{current_index_display}/{total_images}]</td></tr></table>"
+        # Setting rich text re-parses and re-lays out the HTML, so skip it when nothing changed
+        if info_text != self.image_info_label.text():
+            self.image_info_label.setText(info_text)
         
-        # Update window title
-        self.setWindowTitle("🔭 AstroRank (v1.3)")
-        
-        # Clear rank input (but don't focus it - keep focus on main window for arrow keys)
+        # Clear rank input (focus stays on the main window, see init_ui)
         self.rank_input.clear()
         
-        # Set focus to main window so arrow keys work for navigation
-        self.setFocus()
-        
         # Highlight current row in table
-        self.update_table()
+        self.set_current_row(self.previous_index, self.current_index)
+        
+        # Warm the cache for the images the user is likely to view next
+        QTimer.singleShot(50, self._prefetch_neighbors)
     
     def _initialize_key_bindings(self):
         """Initialize key binding data for use in keyPressEvent and helper display"""
@@ -621,6 +990,57 @@ class AstrorankGUI(QMainWindow):
         for action, key_str in self.key_config.items():
             key_list = parse_key_string(key_str)
             self.keys[action] = key_list
+        
+        # (Qt key, shift held) -> action, so keyPressEvent resolves a key with one dict lookup
+        self._key_actions = {}
+        for action in KEY_ACTIONS:
+            for key_str in self.keys.get(action, []):
+                for qt_key, needs_shift in string_to_qt_key(key_str):
+                    self._key_actions.setdefault((qt_key, needs_shift), action)
+        
+        self._key_handlers = {
+            'clear_input': lambda: self.rank_input.clear(),
+            'quit': self.close,
+            'clear_rank': self.clear_rank,
+            'fit_image': self.fit_image,
+            'reset_container': self.reset_image_container,
+            'toggle_helper': self.toggle_helper,
+            'toggle_list': self.toggle_list_visibility,
+            'toggle_dark_mode': self.toggle_dark_mode,
+            'save': self.save_rankings_now,
+            'view_rankings': self.view_rankings,
+            'comment': self.open_comment_dialog,
+            'legacy_survey': self.open_legacy_survey_viewer,
+            'ned_search': self.open_ned_search,
+            'toggle_secondary_dir': self.toggle_secondary_dir,
+            'zoom_in': self.zoom_in,
+            'zoom_out': self.zoom_out,
+            'brightness_increase': self.brightness_increase,
+            'brightness_decrease': self.brightness_decrease,
+            'contrast_increase': self.contrast_increase,
+            'contrast_decrease': self.contrast_decrease,
+            'reset_brightness_contrast': self.reset_brightness_contrast,
+            'submit_and_next': self._submit_and_next,
+            'first_image': lambda: self._submit_pending_then(self.go_to_first),
+            'skip_to_next_unranked': lambda: self._submit_pending_then(self.skip_to_next_unranked),
+            'previous': lambda: self._submit_pending_then(self.go_previous),
+            'next': lambda: self._submit_pending_then(self.go_next),
+        }
+        if self.secondary_enabled:
+            self._key_handlers['wise_toggle'] = self.toggle_secondary_view
+    
+    def _submit_and_next(self):
+        """Submit the typed rank and move to the next image if it was valid"""
+        if self.submit_rank():
+            self.go_next()
+    
+    def _submit_pending_then(self, navigate):
+        """Submit the typed rank, if any, then navigate (unless the typed rank was invalid)"""
+        if self.rank_input.text().strip():
+            if self.submit_rank():  # Only navigate if rank submission was successful
+                navigate()
+        else:
+            navigate()
     
     def _key_matches(self, event_key, action_name, allow_shift=False):
         """Check if a keyboard event matches a configured action key"""
@@ -698,44 +1118,31 @@ class AstrorankGUI(QMainWindow):
         # Update image without triggering layout changes
         self._update_displayed_image()
     
-    def _update_displayed_image(self):
-        """Update the currently displayed image with brightness/contrast applied"""
-        current_file = self.jpg_files[self.current_index]
+    def _update_displayed_image(self, smooth=True):
+        """
+        Update the currently displayed image with brightness/contrast applied
         
-        # Determine which directory to use
-        if self.secondary_dir_enabled and self.use_secondary_dir and self.secondary_dir_path:
-            # Try to find a matching file in secondary directory that contains the primary filename
-            matching_file = find_file_in_secondary_dir(current_file, self.secondary_dir_path)
-            if matching_file and matching_file.exists():
-                image_path = matching_file
-            else:
-                # Fallback to original directory if no match found
-                image_path = self.image_dir / current_file
-        else:
-            image_path = self.image_dir / current_file
+        Args:
+            smooth: Scale with smooth (bilinear) filtering; False renders a quick draft
+        """
+        current_file = self.jpg_files[self.current_index]
+        image_path = self._primary_image_path(self.current_index)
         
         if self.dual_view_active and current_file in self.secondary_images:
             # Update dual view
-            pixmap1 = QPixmap(str(image_path))
-            pixmap2 = QPixmap(self.secondary_images[current_file])
-            pixmap1 = self.apply_brightness_contrast(pixmap1)
-            pixmap2 = self.apply_brightness_contrast(pixmap2)
+            container_width = self.dual_view_container.width()
+            width_per_image = int((container_width - 30) / 2)
+            scaled_width = int(width_per_image * self.dual_view_zoom)
+            scaled1 = self._scaled_pixmap(image_path, scaled_width, smooth)
+            scaled2 = self._scaled_pixmap(self.secondary_images[current_file], scaled_width, smooth)
             
-            if not pixmap1.isNull() and not pixmap2.isNull():
-                container_width = self.dual_view_container.width()
-                width_per_image = int((container_width - 30) / 2)
-                scaled_width = int(width_per_image * self.dual_view_zoom)
-                scaled1 = pixmap1.scaledToWidth(scaled_width, Qt.SmoothTransformation)
-                scaled2 = pixmap2.scaledToWidth(scaled_width, Qt.SmoothTransformation)
+            if not scaled1.isNull() and not scaled2.isNull():
                 self.dual_image_label_1.setPixmap(scaled1)
                 self.dual_image_label_2.setPixmap(scaled2)
         else:
             # Update single view
-            pixmap = QPixmap(str(image_path))
-            pixmap = self.apply_brightness_contrast(pixmap)
-            if not pixmap.isNull():
-                base_width = int(600 * self.zoom_level)
-                scaled_pixmap = pixmap.scaledToWidth(base_width, Qt.SmoothTransformation)
+            scaled_pixmap = self._scaled_pixmap(image_path, int(600 * self.zoom_level), smooth)
+            if not scaled_pixmap.isNull():
                 self.image_label.setPixmap(scaled_pixmap)
     
     def reset_brightness_contrast(self):
@@ -792,6 +1199,152 @@ class AstrorankGUI(QMainWindow):
         self.contrast_label.setText(f"Contrast: {self.contrast_multiplier:.1f}")
         self._update_displayed_image()
     
+    def _primary_image_path(self, index):
+        """Path (as a string) of the image to display for jpg_files[index], honoring the secondary directory toggle"""
+        # Determine which directory to use
+        if self.secondary_dir_enabled and self.use_secondary_dir and self.secondary_dir_path:
+            # Try to find a matching file in secondary directory that contains the primary filename;
+            # the lookup globs the directory, so each image is only looked up once
+            filename = self.jpg_files[index]
+            if filename not in self._secondary_paths:
+                matching_file = find_file_in_secondary_dir(filename, self.secondary_dir_path)
+                self._secondary_paths[filename] = str(matching_file) if matching_file and matching_file.exists() else None
+            if self._secondary_paths[filename] is not None:
+                return self._secondary_paths[filename]
+        
+        # Fallback to original directory if no match found
+        return self._image_paths[index]
+    
+    def _load_pixmap(self, path, max_width, draft=False):
+        """
+        Load an image, reusing the decoded pixmap if the file is unchanged since it was last loaded
+        
+        Args:
+            path: Path to the image file
+            max_width: Decode width, one of DECODE_WIDTHS
+            draft: Settle for an already decoded smaller copy rather than decoding now
+            
+        Returns:
+            QPixmap (null if the file could not be read)
+        """
+        key = _pixmap_cache_key(path, max_width)
+        if key is None:
+            return QPixmap()
+        
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None:
+            return pixmap
+        
+        if draft:
+            # Zoom drafts are upscaled anyway; the sharper decode happens once zooming settles
+            for width in reversed(DECODE_WIDTHS):
+                if width < max_width:
+                    pixmap = QPixmapCache.find(_pixmap_cache_key(path, width))
+                    if pixmap is not None:
+                        return pixmap
+        
+        pixmap = QPixmap.fromImage(_read_image(path, max_width))
+        if not pixmap.isNull():
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+    
+    def _scaled_pixmap(self, path, width, smooth=True):
+        """
+        Load an image with brightness/contrast applied, scaled to the given width
+        
+        Smoothly scaled copies of unadjusted images are cached too, so revisiting an
+        image or returning to an earlier zoom level skips the smooth rescale.
+        
+        Args:
+            path: Path to the image file
+            width: Width in pixels to scale to
+            smooth: Use smooth (bilinear) scaling; False is a fast nearest-neighbour draft
+            
+        Returns:
+            QPixmap (null if the file could not be read)
+        """
+        decode_width = _decode_width(width)
+        key = _pixmap_cache_key(path, decode_width)
+        if key is None:
+            return QPixmap()
+        
+        adjusted = self.brightness_multiplier != 1.0 or self.contrast_multiplier != 1.0
+        scaled_key = f"{key}|{width}"
+        if not adjusted:
+            scaled = QPixmapCache.find(scaled_key)
+            if scaled is not None:
+                return scaled
+        
+        pixmap = self._load_pixmap(path, decode_width, draft=not smooth)
+        if pixmap.isNull():
+            return pixmap
+        if adjusted:
+            # Zoom steps reuse the adjusted copy; only a new image or new brightness/contrast re-runs the adjustment
+            adjustment = (self.brightness_multiplier, self.contrast_multiplier)
+            if adjustment != self._adjustment:
+                self._adjusted_pixmaps.clear()
+                self._adjustment = adjustment
+            source = self._adjusted_pixmaps.get(pixmap.cacheKey())
+            if source is None:
+                source = self._adjusted_pixmaps[pixmap.cacheKey()] = self.apply_brightness_contrast(pixmap)
+        else:
+            source = pixmap
+        transformation = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+        scaled = source.scaledToWidth(width, transformation)
+        if smooth and not adjusted:
+            QPixmapCache.insert(scaled_key, scaled)
+        return scaled
+    
+    def _decode_in_background(self, path, width, pool=None):
+        """
+        Start decoding an image on the thread pool unless it is cached or already being decoded
+        
+        Args:
+            path: Path to the image file
+            width: Width in pixels the image will be displayed at
+            pool: QThreadPool to decode on (default: the pool for the displayed image)
+            
+        Returns:
+            True if the image is (or will be) decoded in the background, False if it is already cached
+        """
+        decode_width = _decode_width(width)
+        key = _pixmap_cache_key(path, decode_width)
+        if key is None or QPixmapCache.find(key) is not None:
+            return False
+        if key not in self._decode_tasks:
+            task = ImageDecodeTask(path, key, decode_width)
+            task.signals.finished.connect(self._on_image_decoded)
+            self._decode_tasks[key] = task
+            (pool or self._decode_pool).start(task)
+        return True
+    
+    def _prefetch_neighbors(self):
+        """Decode the images around the current one in the background so navigating to them is instant"""
+        if self.use_secondary_dir:
+            return  # Resolving secondary directory paths globs the directory on the GUI thread; not worth it ahead of time
+        indices = [self.current_index + offset for offset in PREFETCH_OFFSETS]
+        # Also the target of "skip to next unranked", which may be far from the current image
+        indices.append(self.unranked.next_unranked(self.current_index + 1))
+        width = int(600 * self.zoom_level)
+        for index in indices:
+            if 0 <= index < len(self.jpg_files):
+                self._decode_in_background(self._primary_image_path(index), width, self._prefetch_pool)
+    
+    def _on_image_decoded(self, key, image):
+        """Cache a background-decoded image and show it if it is still the one being waited on"""
+        task = self._decode_tasks.pop(key, None)
+        if not image.isNull():
+            QPixmapCache.insert(key, QPixmap.fromImage(image))
+        
+        # Ignore stale results: the user may have moved on while this image was decoding
+        if task is None or task.path != self._awaited_image_path:
+            return
+        self._awaited_image_path = None
+        if image.isNull():
+            self.image_label.setText("Failed to load image")
+        else:
+            self._update_displayed_image()
+    
     def apply_brightness_contrast(self, pixmap):
         """Apply brightness and contrast adjustments to a pixmap"""
         if self.brightness_multiplier == 1.0 and self.contrast_multiplier == 1.0:
@@ -921,39 +1474,20 @@ class AstrorankGUI(QMainWindow):
     def display_secondary_view(self):
         """Display secondary image alongside original or just original"""
         current_file = self.jpg_files[self.current_index]
-        
-        # Determine which directory to use for primary display
-        if self.secondary_dir_enabled and self.use_secondary_dir and self.secondary_dir_path:
-            # Try to find a matching file in secondary directory that contains the primary filename
-            matching_file = find_file_in_secondary_dir(current_file, self.secondary_dir_path)
-            if matching_file and matching_file.exists():
-                primary_image_path = matching_file
-            else:
-                # Fallback to original directory if no match found
-                primary_image_path = self.image_dir / current_file
-        else:
-            primary_image_path = self.image_dir / current_file
+        primary_image_path = self._primary_image_path(self.current_index)
         
         if self.dual_view_active and current_file in self.secondary_images:
-            # Load both images in separate containers
-            pixmap1 = QPixmap(str(primary_image_path))
-            pixmap2 = QPixmap(self.secondary_images[current_file])
+            # Calculate width for each image (equal size side-by-side)
+            # Each image gets half the container width minus spacing
+            container_width = self.dual_view_container.width()
+            width_per_image = int((container_width - 30) / 2)  # 30px for spacing/margins
             
-            # Apply brightness and contrast
-            pixmap1 = self.apply_brightness_contrast(pixmap1)
-            pixmap2 = self.apply_brightness_contrast(pixmap2)
+            # Load both images (brightness and contrast applied), scaled by the same zoom level
+            scaled_width = int(width_per_image * self.dual_view_zoom)
+            scaled1 = self._scaled_pixmap(primary_image_path, scaled_width)
+            scaled2 = self._scaled_pixmap(self.secondary_images[current_file], scaled_width)
             
-            if not pixmap1.isNull() and not pixmap2.isNull():
-                # Calculate width for each image (equal size side-by-side)
-                # Each image gets half the container width minus spacing
-                container_width = self.dual_view_container.width()
-                width_per_image = int((container_width - 30) / 2)  # 30px for spacing/margins
-                
-                # Scale both images by the same zoom level
-                scaled_width = int(width_per_image * self.dual_view_zoom)
-                scaled1 = pixmap1.scaledToWidth(scaled_width, Qt.SmoothTransformation)
-                scaled2 = pixmap2.scaledToWidth(scaled_width, Qt.SmoothTransformation)
-                
+            if not scaled1.isNull() and not scaled2.isNull():
                 # Display in separate labels
                 self.dual_image_label_1.setPixmap(scaled1)
                 self.dual_image_label_2.setPixmap(scaled2)
@@ -961,97 +1495,54 @@ class AstrorankGUI(QMainWindow):
                 self.dual_image_label_1.setText("Failed to load original")
                 self.dual_image_label_2.setText(f"Failed to load {self.secondary_name}")
         else:
-            # Just show original image in single container
-            pixmap = QPixmap(str(primary_image_path))
+            # Just show original image in single container; decode off the GUI thread if not cached
+            if self._decode_in_background(primary_image_path, int(600 * self.zoom_level)):
+                self._awaited_image_path = primary_image_path
+                self.image_label.setText(f"Loading {current_file}...")
+                return
+            self._awaited_image_path = None
             
-            # Apply brightness and contrast
-            pixmap = self.apply_brightness_contrast(pixmap)
+            # Load with brightness and contrast applied
+            scaled_pixmap = self._scaled_pixmap(primary_image_path, int(600 * self.zoom_level))
             
-            if pixmap.isNull():
+            if scaled_pixmap.isNull():
                 self.image_label.setText("Failed to load image")
             else:
-                base_width = int(600 * self.zoom_level)
-                scaled_pixmap = pixmap.scaledToWidth(base_width, Qt.SmoothTransformation)
                 self.image_label.setPixmap(scaled_pixmap)
     
-    def update_table(self):
-        """Update the rankings table - only update changed rows for speed"""
-        # On first call, initialize all rows
-        if not self.table_initialized:
-            rows_to_update = set(range(len(self.jpg_files)))
-            self.table_initialized = True
-            # Initialize all row backgrounds on first call
-            default_bg = QColor(30, 30, 30) if self.dark_mode else QColor(255, 255, 255)
-            num_columns = 5 if self.secondary_enabled else 4
-            for i in range(len(self.jpg_files)):
-                for j in range(num_columns):
-                    if self.table.item(i, j) is None:
-                        self.table.setItem(i, j, QTableWidgetItem())
-                    self.table.item(i, j).setBackground(default_bg)
-        else:
-            # Always update current row and previous row
-            rows_to_update = set()
-            rows_to_update.add(self.current_index)
-            if self.previous_index >= 0 and self.previous_index != self.current_index:
-                rows_to_update.add(self.previous_index)
-        
-        for i in rows_to_update:
-            if i >= len(self.jpg_files):
-                continue
-                
-            filename = self.jpg_files[i]
-            
-            # Filename
-            name_item = QTableWidgetItem(filename)
-            self.table.setItem(i, 0, name_item)
-            
-            # Rank
-            rank = self.rankings.get(filename, "")
-            rank_item = QTableWidgetItem(str(rank))
-            rank_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 1, rank_item)
-            
-            # Ranked? (checkmark)
-            ranked_item = QTableWidgetItem("✓" if filename in self.rankings else "")
-            ranked_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 2, ranked_item)
-            
-            # Comments (no truncation - columns are resizable)
-            comment_text = self.comments.get(filename, "")
-            comment_item = QTableWidgetItem(comment_text)
-            self.table.setItem(i, 3, comment_item)
-            
-            # Secondary image indicator (checkmark if secondary image downloaded) - only if enabled
-            if self.secondary_enabled:
-                secondary_item = QTableWidgetItem("✓" if filename in self.secondary_images else "")
-                secondary_item.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(i, 4, secondary_item)
-            
-            # Highlight current row, unhighlight previous
-            num_columns = 5 if self.secondary_enabled else 4
-            text_color = QColor(255, 255, 255) if self.dark_mode else QColor(0, 0, 0)
-            if i == self.current_index:
-                highlight_color = QColor(70, 120, 180) if self.dark_mode else QColor(173, 216, 230)
-                for j in range(num_columns):
-                    self.table.item(i, j).setBackground(highlight_color)
-                    self.table.item(i, j).setForeground(text_color)
-            else:
-                bg_color = QColor(30, 30, 30) if self.dark_mode else QColor(255, 255, 255)
-                for j in range(num_columns):
-                    self.table.item(i, j).setBackground(bg_color)
-                    self.table.item(i, j).setForeground(text_color)
-        
-        # Force table repaint
-        self.table.viewport().update()
-        self.previous_index = self.current_index
-        
-        # Scroll to current row to keep it visible (unless navigating by click)
+    def _drop_hidden_thumbnail_requests(self):
+        """Cancel queued thumbnail decodes for rows scrolled out of view, so a fast scroll does not queue the whole table"""
+        first_row = self.table.rowAt(0)
+        last_row = self.table.rowAt(self.table.viewport().height() - 1)
+        if first_row < 0:
+            return
+        self.table_model.drop_thumbnail_requests(first_row, last_row if last_row >= 0 else self.table_model.rowCount() - 1)
+    
+    def refresh_row(self, row):
+        """Repaint one table row after its rank, comment or secondary status changed"""
+        self.table_model.refresh_row(row)
+    
+    def set_current_row(self, old_row, new_row):
+        """Move the table highlight from old_row to new_row and keep the new row visible"""
+        if old_row != self.table_model.current_row:
+            self.table_model.refresh_row(old_row, [Qt.BackgroundRole])
+        self.table_model.set_current_row(new_row)
+        self.previous_index = new_row
+        
+        # Scroll to current row to keep it visible (unless navigating by click); queued so that
+        # several moves within one event-loop iteration cost a single scroll and repaint
         if not self.skip_scroll:
-            self.table.scrollToItem(self.table.item(self.current_index, 0), 
-                                   self.table.PositionAtCenter)
+            if not self._scroll_pending:
+                self._scroll_pending = True
+                QTimer.singleShot(0, self._scroll_to_current_row)
         else:
             self.skip_scroll = False  # Reset flag for next navigation
     
+    def _scroll_to_current_row(self):
+        """Center the table on the current row (queued by set_current_row)"""
+        self._scroll_pending = False
+        self.table.scrollTo(self.table_model.index(self.table_model.current_row, 0), QTableView.PositionAtCenter)
+    
     def submit_rank(self):
         """Submit a rank for the current image. Returns True if successful, False if invalid."""
         rank_str = self.rank_input.text().strip()
@@ -1068,19 +1559,22 @@ class AstrorankGUI(QMainWindow):
             QMessageBox.warning(self, "Invalid Input", error_msg)
             return False
         
+        self.submit_rank_value(rank)
+        return True
+    
+    def submit_rank_value(self, rank):
+        """Record an already validated rank for the current image"""
         current_file = self.jpg_files[self.current_index]
         self.rankings[current_file] = rank
+        self.unranked.mark_ranked(self.current_index)
         self.rank_input.clear()
         
-        # Batch saves: only save to disk every 10 ranks or on close
-        self.save_counter += 1
-        if self.save_counter >= 10:
-            save_rankings(str(self.output_file), self.rankings, self.jpg_files, self.comments)
-            self.save_counter = 0
+        # Journal the rank immediately (O(1)); the full files are rewritten once ranking pauses
+        append_rank(self._output_file_str, current_file, rank, self._journal_file())
+        self._schedule_save()
         
-        # Update table (only affected rows)
-        self.update_table()
-        return True
+        # Update table (only the ranked row)
+        self.refresh_row(self.current_index)
     
     def go_previous(self):
         """Go to previous image"""
@@ -1141,6 +1635,8 @@ class AstrorankGUI(QMainWindow):
         """Toggle between dark and light modes"""
         self.dark_mode = not self.dark_mode
         
+        # Restyle the whole window with painting suspended, so it is redrawn once
+        self.setUpdatesEnabled(False)
         if self.dark_mode:
             self.dark_mode_button.setText("Light")
             self.apply_dark_stylesheet()
@@ -1149,30 +1645,45 @@ class AstrorankGUI(QMainWindow):
             self.apply_light_stylesheet()
         
         # Update row colors for the new mode
-        default_bg = QColor(30, 30, 30) if self.dark_mode else QColor(255, 255, 255)
-        highlight_color = QColor(70, 120, 180) if self.dark_mode else QColor(173, 216, 230)
-        text_color = QColor(255, 255, 255) if self.dark_mode else QColor(0, 0, 0)
-        
-        num_columns = 5 if self.secondary_enabled else 4
-        for i in range(len(self.jpg_files)):
-            if i == self.current_index:
-                bg_color = highlight_color
-            else:
-                bg_color = default_bg
-            
-            for j in range(num_columns):
-                if self.table.item(i, j) is not None:
-                    self.table.item(i, j).setBackground(bg_color)
-                    self.table.item(i, j).setForeground(text_color)
+        self.table_model.set_dark_mode(self.dark_mode)
+        self.setUpdatesEnabled(True)
+    
+    def _journal_file(self):
+        """Return the open rankings journal, opening it on first use (None if it cannot be opened)"""
+        if self._journal is None:
+            try:
+                self._journal = open_journal(self._output_file_str)
+            except OSError as e:
+                print(f"Error opening rankings journal: {e}")
+        return self._journal
+    
+    def _close_journal(self):
+        """Close the rankings journal; compacting deletes the file, so it must not stay open"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+    
+    def _schedule_save(self):
+        """Mark rankings/comments as changed and (re)start the debounced save"""
+        self._dirty = True
+        self._save_timer.start(SAVE_DELAY_MS)
+    
+    def _flush_save(self, force=False):
+        """Rewrite the rankings and comments files if anything changed since the last save"""
+        self._save_timer.stop()
+        if not (self._dirty or force):
+            return
+        self._close_journal()
+        save_rankings(self._output_file_str, self.rankings, self.jpg_files, self.comments)
+        self._dirty = False
     
     def save_rankings_now(self):
         """Save rankings and comments to disk (without quitting)"""
-        save_rankings(str(self.output_file), self.rankings, self.jpg_files, self.comments)
-        self.save_counter = 0  # Reset counter
+        self._flush_save(force=True)
         print("Rankings file and rankings+comments file saved!")
         
         # Show success dialog for 5 seconds
-        comments_file = str(self.output_file).rsplit('.', 1)[0] + '_comments.txt'
+        comments_file = self._output_file_str.rsplit('.', 1)[0] + '_comments.txt'
         dialog = QMessageBox(self)
         dialog.setWindowTitle("Save Successful")
         dialog.setText(f"Successfully saved:\n\n{self.output_file}\n\n{comments_file}")
@@ -1188,7 +1699,9 @@ class AstrorankGUI(QMainWindow):
     
     def view_rankings(self):
         """Open a window to view the rankings files"""
-        rankings_viewer = RankingsViewer(self, str(self.output_file), self.dark_mode)
+        # Write both files (folding journaled ranks in) so the viewer shows current ranks and comments
+        self._flush_save(force=True)
+        rankings_viewer = RankingsViewer(self, self._output_file_str, self.dark_mode)
         if self.dark_mode:
             rankings_viewer.setStyleSheet(self.styleSheet())
         rankings_viewer.exec_()
@@ -1200,6 +1713,7 @@ class AstrorankGUI(QMainWindow):
             return
         
         self.use_secondary_dir = not self.use_secondary_dir
+        self._secondary_paths.clear()  # Pick up files added to the secondary directory since the last toggle
         self.display_image()
     
     def apply_dark_stylesheet(self):
@@ -1232,11 +1746,11 @@ class AstrorankGUI(QMainWindow):
             QPushButton:pressed {
                 background-color: #1d1d1d;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #1e1e1e;
                 gridline-color: #3d3d3d;
             }
-            QTableWidget::item {
+            QTableView::item {
                 color: #e0e0e0;
                 padding: 2px;
             }
@@ -1306,11 +1820,13 @@ class AstrorankGUI(QMainWindow):
         current_file = self.jpg_files[self.current_index]
         if current_file in self.rankings:
             del self.rankings[current_file]
-            # Save immediately
-            save_rankings(str(self.output_file), self.rankings, self.jpg_files)
+            self.unranked.mark_unranked(self.current_index)
+            # Journal the cleared rank immediately, like submit_rank (this also keeps comments intact)
+            append_rank(self._output_file_str, current_file, journal=self._journal_file())
+            self._schedule_save()
             # Update display
             self.display_image()
-            self.update_table()
+            self.refresh_row(self.current_index)
     
     def zoom_in(self):
         """Increase image zoom by 10%"""
@@ -1325,7 +1841,7 @@ class AstrorankGUI(QMainWindow):
                 expanded_size = min(expanded_size, 1400)  # Cap at 1400
                 self.image_container.setMaximumHeight(expanded_size)
                 self.image_container.setMaximumWidth(expanded_size)
-        self._update_displayed_image()
+        self._render_zoom()
     
     def zoom_out(self):
         """Decrease image zoom by 10%"""
@@ -1343,7 +1859,12 @@ class AstrorankGUI(QMainWindow):
                 expanded_size = min(expanded_size, 1400)
                 self.image_container.setMaximumHeight(expanded_size)
                 self.image_container.setMaximumWidth(expanded_size)
-        self._update_displayed_image()
+        self._render_zoom()
+    
+    def _render_zoom(self):
+        """Show a fast draft at the new zoom level now and the smooth render once zooming pauses"""
+        self._update_displayed_image(smooth=False)
+        self._zoom_timer.start()
     
     def fit_image(self):
         """Fit the image to the image container"""
@@ -1378,9 +1899,7 @@ class AstrorankGUI(QMainWindow):
     
     def skip_to_next_unranked(self):
         """Skip to next unranked image"""
-        next_index = find_next_unranked(
-            self.jpg_files, self.rankings, self.current_index + 1
-        )
+        next_index = self.unranked.next_unranked(self.current_index + 1)
         
         if next_index == -1:
             QMessageBox.information(self, "All Ranked", "All images have been ranked!")
@@ -1407,16 +1926,17 @@ class AstrorankGUI(QMainWindow):
                 self.comments[current_file] = text
             elif current_file in self.comments:
                 del self.comments[current_file]
+            self._schedule_save()
             # Update the table to show the new comment
-            self.update_table()
+            self.refresh_row(self.current_index)
     
-    def on_table_click(self, item):
+    def on_table_click(self, index):
         """Handle clicks on the table"""
         # Save pending rank before switching images
         if self.rank_input.text().strip():
             self.submit_rank()
         
-        row = item.row()
+        row = index.row()
         self.current_index = row
         self.skip_scroll = True  # Don't scroll to center on click navigation
         self.display_image()
@@ -1425,6 +1945,14 @@ class AstrorankGUI(QMainWindow):
         """Handle keyboard events using configurable keys from config.json"""
         key = event.key()
         
+        action = self._key_actions.get((key, bool(event.modifiers() & Qt.ShiftModifier)))
+        
+        # Nothing to navigate or rank until the image directory has been scanned
+        if not self.jpg_files:
+            if action == 'quit':
+                self.close()
+            return
+        
         # Disable navigation keys during secondary image download
         if self.downloading and key in [Qt.Key_Left, Qt.Key_Right, Qt.Key_Up, Qt.Key_Down, Qt.Key_Return, Qt.Key_Enter]:
             return
@@ -1433,115 +1961,53 @@ class AstrorankGUI(QMainWindow):
         if self._check_rank_key(event):
             return  # Rank key was handled
         
-        # Check each action against configured keys
-        if self._key_matches_action(event, 'clear_input'):
-            self.rank_input.clear()
-        elif self._key_matches_action(event, 'quit'):
-            self.close()
-        elif self._key_matches_action(event, 'clear_rank'):
-            self.clear_rank()
-        elif self._key_matches_action(event, 'fit_image'):
-            self.fit_image()
-        elif self._key_matches_action(event, 'reset_container'):
-            self.reset_image_container()
-        elif self._key_matches_action(event, 'toggle_helper'):
-            self.toggle_helper()
-        elif self._key_matches_action(event, 'toggle_list'):
-            self.toggle_list_visibility()
-        elif self._key_matches_action(event, 'toggle_dark_mode'):
-            self.toggle_dark_mode()
-        elif self._key_matches_action(event, 'save'):
-            self.save_rankings_now()
-        elif self._key_matches_action(event, 'view_rankings'):
-            self.view_rankings()
-        elif self._key_matches_action(event, 'comment'):
-            self.open_comment_dialog()
-        elif self._key_matches_action(event, 'wise_toggle'):
-            if self.secondary_enabled:
-                self.toggle_secondary_view()
-        elif self._key_matches_action(event, 'legacy_survey'):
-            self.open_legacy_survey_viewer()
-        elif self._key_matches_action(event, 'ned_search'):
-            self.open_ned_search()
-        elif self._key_matches_action(event, 'toggle_secondary_dir'):
-            self.toggle_secondary_dir()
-        elif self._key_matches_action(event, 'zoom_in'):
-            self.zoom_in()
-        elif self._key_matches_action(event, 'zoom_out'):
-            self.zoom_out()
-        elif self._key_matches_action(event, 'brightness_increase'):
-            self.brightness_increase()
-        elif self._key_matches_action(event, 'brightness_decrease'):
-            self.brightness_decrease()
-        elif self._key_matches_action(event, 'contrast_increase'):
-            self.contrast_increase()
-        elif self._key_matches_action(event, 'contrast_decrease'):
-            self.contrast_decrease()
-        elif self._key_matches_action(event, 'reset_brightness_contrast'):
-            self.reset_brightness_contrast()
-        elif self._key_matches_action(event, 'submit_and_next'):
-            if self.submit_rank():  # Only navigate if rank submission was successful
-                self.go_next()
-        elif self._key_matches_action(event, 'first_image'):
-            if self.rank_input.text().strip():
-                if self.submit_rank():  # Only navigate if rank submission was successful
-                    self.go_to_first()
-            else:
-                self.go_to_first()
-        elif self._key_matches_action(event, 'skip_to_next_unranked'):
-            if self.rank_input.text().strip():
-                if self.submit_rank():  # Only navigate if rank submission was successful
-                    self.skip_to_next_unranked()
-            else:
-                self.skip_to_next_unranked()
-        elif self._key_matches_action(event, 'previous'):
-            if self.rank_input.text().strip():
-                if self.submit_rank():  # Only navigate if rank submission was successful
-                    self.go_previous()
-            else:
-                self.go_previous()
-        elif self._key_matches_action(event, 'next'):
-            if self.rank_input.text().strip():
-                if self.submit_rank():  # Only navigate if rank submission was successful
-                    self.go_next()
-            else:
-                self.go_next()
-        else:
+        # Run the configured action for this key (a disabled action does nothing)
+        if action is None:
             super().keyPressEvent(event)
+            return
+        handler = self._key_handlers.get(action)
+        if handler is not None:
+            handler()
     
     def _check_rank_key(self, event) -> bool:
         """Check if a key is mapped to a rank value and set input accordingly"""
         key = event.key()
         if key in self.rank_map:
             rank_value = self.rank_map[key]
-            self.rank_input.setText(str(rank_value))
             
-            # If auto-submit is enabled, submit the rank and go to next
+            # If auto-submit is enabled, submit the rank and go to next; the configured
+            # value needs no round trip through the text box and re-validation
             if self.auto_submit_checkbox.isChecked():
-                self.submit_rank()
+                self.submit_rank_value(rank_value)
                 self.go_next()
+            else:
+                self.rank_input.setText(str(rank_value))
             
             return True
         return False
     
-    def _key_matches_action(self, event, action_name):
-        """Check if keyboard event matches a configured action"""
-        key = event.key()
-        has_shift = bool(event.modifiers() & Qt.ShiftModifier)  # Convert to boolean
-        key_strings = self.keys.get(action_name, [])
-        
-        for key_str in key_strings:
-            qt_keys = string_to_qt_key(key_str)
-            for qt_key, needs_shift in qt_keys:
-                if key == qt_key:
-                    # Check shift modifier requirement
-                    if needs_shift == has_shift:
-                        return True
-        return False
-    
     def closeEvent(self, event):
         """Handle window close"""
-        save_rankings(str(self.output_file), self.rankings, self.jpg_files, self.comments)
+        if self.scan_worker.isRunning():
+            # A QThread must not be destroyed while running, but waiting here would freeze the window
+            # on the slow drives the scan runs in the background for: hide now, close once it is done
+            self._close_requested = True
+            self.hide()
+            event.ignore()
+            return
+        # Write the files on a thread so the window closes at once; the application waits for it
+        # only when it quits. Nothing to write if no images were loaded
+        if self.jpg_files and self._close_save_thread is None:
+            self._save_timer.stop()
+            self._close_journal()
+            self._close_save_thread = threading.Thread(
+                target=save_rankings,
+                args=(self._output_file_str, dict(self.rankings), list(self.jpg_files), dict(self.comments))
+            )
+            self._close_save_thread.start()
+            QApplication.instance().aboutToQuit.connect(self._close_save_thread.join)
+        # Release the decoded images
+        QPixmapCache.clear()
         event.accept()
     
     def _load_comments(self):
@@ -1584,16 +2050,19 @@ class AstrorankGUI(QMainWindow):
                 self.comments[current_file] = new_comment
             elif current_file in self.comments:
                 del self.comments[current_file]
-            self.update_table()
+            self._schedule_save()
+            self.refresh_row(self.current_index)
     
-    def on_table_double_click(self, item):
+    def on_table_double_click(self, index):
         """Handle double-click on table to edit comment"""
-        column = item.column()
-        row = item.row()
+        column = index.column()
+        row = index.row()
         
         # Only allow editing comments (column 3)
         if column == 3:
             self.current_index = row
+            self.skip_scroll = True  # Row was clicked, so it is already visible
+            self.set_current_row(self.previous_index, row)
             self.open_comment_dialog()
 
 
@@ -1669,19 +2138,8 @@ class RankingsViewer(QDialog):
             self.text_display.setPlainText(f"File not found: {self.comments_file}")
 
 
-class HelperDialog(QDialog):
-    """Helper dialog showing keyboard shortcuts and features"""
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Astrorank Helper")
-        self.setGeometry(200, 200, 600, 500)
-        
-        layout = QVBoxLayout()
-        
-        help_text = QTextEdit()
-        help_text.setReadOnly(True)
-        help_text.setText("""
+# Contents of the helper window
+HELP_HTML = """
 <h2>AstroRank Keyboard Shortcuts</h2><br>
 
 <b>Image Navigation:</b><br>
@@ -1745,7 +2203,31 @@ class HelperDialog(QDialog):
 <br>
 
 <p><i>Tip: Press a number key (or backtick/spacebar for 0) to fill the rank field, then use arrow keys to navigate—the rank will be submitted automatically.</i></p>
-        """)
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _help_document():
+    """Helper window contents, parsed from HELP_HTML once per process (needs the QApplication)"""
+    # Owned by the application so Qt, not Python's exit-time cleanup, destroys it
+    document = QTextDocument(QApplication.instance())
+    document.setHtml(HELP_HTML)
+    return document
+
+
+class HelperDialog(QDialog):
+    """Helper dialog showing keyboard shortcuts and features"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Astrorank Helper")
+        self.setGeometry(200, 200, 600, 500)
+        
+        layout = QVBoxLayout()
+        
+        help_text = QTextEdit()
+        help_text.setReadOnly(True)
+        help_text.setDocument(_help_document())
         
         layout.addWidget(help_text)
         
@@ -5,26 +5,162 @@ Utility functions for astrorank
 import os
 import re
 import json
+import hashlib
+import tempfile
+import warnings
+import functools
+from io import BytesIO
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+# orjson parses config files faster when installed; fall back to the stdlib parser otherwise
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Image file extensions picked up by get_jpg_files (compared case-insensitively)
+JPEG_EXTENSIONS = ('.jpg', '.jpeg')
+
+# Sexagesimal coordinates in filenames: HHMMSS.SS+/-DDMMSS.SS (e.g. 085925.43+074849.05)
+_SEXAGESIMAL_RE = re.compile(r'(\d{2}\d{2}\d{2}(?:\.\d+)?)[+\-](\d{2}\d{2}\d{2}(?:\.\d+)?)')
+
+# Decimal-degree coordinates in filenames: _<ra>_<dec> (e.g. _100.00371_-69.056759)
+_DECIMAL_RE = re.compile(r'_(-?\d+\.?\d*)_(-?\d+\.?\d*)')
+
+# Directory where downloaded FITS cutouts are cached between sessions, and its size limit;
+# the least recently used cutouts are deleted beyond it
+CACHE_DIR = Path.home() / ".cache" / "astrorank"
+CACHE_MAX_BYTES = 1024 ** 3
+
+# Shared HTTP session (created lazily) so repeated downloads reuse TCP/TLS connections
+_http_session = None
+
+
+def _get_http_session() -> requests.Session:
+    """Return the shared HTTP session, creating it on first use."""
+    global _http_session
+    if _http_session is None:
+        _http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        _http_session.mount("http://", adapter)
+        _http_session.mount("https://", adapter)
+    return _http_session
+
+
+def _read_fits_data(content: bytes):
+    """
+    Parse FITS bytes and return the primary image as float32.
+    
+    Raises if the payload is not FITS (e.g. an HTML error page) or is truncated.
+    """
+    import numpy as np
+    from astropy.io import fits
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # Truncation is reported by the exception when reading the data
+        with fits.open(BytesIO(content), memmap=False) as hdul:
+            data = hdul[0].data
+            if data is None:
+                raise ValueError("FITS file has no image data")
+            return data.astype(np.float32)
+
+
+def _trim_cache():
+    """Delete the least recently used cutouts once CACHE_DIR grows beyond CACHE_MAX_BYTES"""
+    try:
+        entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                   for entry in os.scandir(CACHE_DIR) if entry.name.endswith(".fits")]
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    if total <= CACHE_MAX_BYTES:
+        return
+    
+    # Trim to 90% of the cap so the directory is not rescanned on every new download
+    for _, size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Already removed, e.g. by another download process
+        total -= size
+        if total <= CACHE_MAX_BYTES * 0.9:
+            break
+
+
+def fetch_fits_data(url: str, use_cache: bool = True, session: Optional[requests.Session] = None):
+    """
+    Download a FITS cutout and return its primary image, using the on-disk cache when possible.
+    
+    Cache entries are keyed by a hash of the URL, which encodes the coordinates,
+    layer, size and bands of the cutout. A download is only cached once it has parsed
+    as FITS, so an error page or truncated payload is fetched again next time; a cached
+    entry that no longer parses is replaced. The cache is kept under CACHE_MAX_BYTES by
+    evicting the least recently used entries.
+    
+    Args:
+        url: URL of the FITS cutout
+        use_cache: If True, read from and write to CACHE_DIR
+        session: requests.Session to download with (default: the shared session)
+        
+    Returns:
+        Primary HDU image data as a float32 numpy array
+    """
+    key = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    cache_path = CACHE_DIR / f"{key}.fits"
+    
+    if use_cache and cache_path.exists():
+        try:
+            data = _read_fits_data(cache_path.read_bytes())
+            os.utime(cache_path)  # Mark as recently used for eviction
+            return data
+        except Exception:
+            pass  # Corrupt or evicted meanwhile; download it again
+    
+    response = (session or _get_http_session()).get(url, timeout=30)
+    response.raise_for_status()
+    content = response.content
+    data = _read_fits_data(content)  # Raises before anything invalid is cached
+    
+    if use_cache:
+        # Write to a temporary file and rename so a partial download is never cached
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, cache_path)
+            _trim_cache()
+        except OSError as e:
+            print(f"Warning: Could not write FITS cache {cache_path}: {e}")
+    
+    return data
+
 
 def get_jpg_files(directory: str) -> List[str]:
     """
-    Get all .jpg files from a directory, sorted alphabetically.
+    Get all JPEG files (.jpg or .jpeg, any case) from a directory, sorted alphabetically.
     
     Args:
         directory: Path to the directory containing images
         
     Returns:
-        List of .jpg filenames (not full paths)
+        List of JPEG filenames (not full paths)
     """
-    dir_path = Path(directory)
-    if not dir_path.exists():
+    if not os.path.exists(directory):
         raise FileNotFoundError(f"Directory not found: {directory}")
     
-    jpg_files = sorted([f.name for f in dir_path.glob("*.jpg")])
+    # os.scandir yields names without building a Path per entry, and is_file()
+    # uses the file type cached from the directory listing (only symlinks need a stat)
+    with os.scandir(directory) as entries:
+        jpg_files = sorted(
+            entry.name for entry in entries
+            if entry.name.lower().endswith(JPEG_EXTENSIONS) and entry.is_file()
+        )
     return jpg_files
 
 
@@ -62,40 +198,215 @@ def find_file_in_secondary_dir(primary_filename: str, secondary_dir: Path) -> Op
     return None
 
 
+def get_journal_file(output_file: str) -> str:
+    """
+    Get the path of the journal that records rank changes since the last full save.
+    
+    Args:
+        output_file: Path to the rankings file
+        
+    Returns:
+        Path to the journal file (e.g., rankings.txt.journal)
+    """
+    return str(output_file) + ".journal"
+
+
 def load_rankings(output_file: str) -> Dict[str, int]:
     """
     Load rankings from a previous session.
     
+    Reads the rankings file and then replays any rank changes left in its
+    journal (see append_rank), the last entry for a file winning.
+    
     Args:
         output_file: Path to the rankings file
         
     Returns:
         Dictionary with filename as key and rank as value
     """
-    rankings = {}
+    rankings = _load_rankings_file(output_file)
+    
+    journal_file = get_journal_file(output_file)
+    if os.path.exists(journal_file):
+        try:
+            # One read and a C-level split instead of Python-level line iteration
+            with open(journal_file, 'r') as f:
+                data = f.read()
+            for line in data.splitlines():
+                filename, _, rank = line.partition('\t')
+                if not filename:
+                    continue
+                if not rank:
+                    # Empty rank records a cleared rank
+                    rankings.pop(filename, None)
+                    continue
+                try:
+                    rankings[filename] = int(rank)
+                except ValueError:
+                    continue
+        except Exception as e:
+            print(f"Error replaying rankings journal: {e}")
+    
+    return rankings
+
+
+def _load_rankings_file(output_file: str) -> Dict[str, int]:
+    """
+    Parse a rankings file.
+    
+    The file is parsed in a single vectorized pass; if it contains lines that
+    do not fit the two-column layout, it falls back to parsing line by line.
     
-    if not os.path.exists(output_file):
-        return rankings
+    Args:
+        output_file: Path to the rankings file
+        
+    Returns:
+        Dictionary with filename as key and rank as value
+    """
+    if not os.path.exists(output_file) or os.path.getsize(output_file) == 0:
+        return {}
+    
+    try:
+        import numpy as np
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # Blank lines trigger an "empty line" UserWarning; they are just skipped
+            table = np.loadtxt(output_file, dtype=str, delimiter='\t', comments=None, ndmin=2)
+        # Unranked files are written with an empty rank field
+        ranked = table[table[:, 1] != '']
+        return dict(zip(ranked[:, 0].tolist(), ranked[:, 1].astype(int).tolist()))
+    except (ImportError, ValueError, IndexError):
+        return _load_rankings_by_line(output_file)
+    except Exception as e:
+        print(f"Error loading rankings: {e}")
+        return {}
+
+
+def _load_rankings_by_line(output_file: str) -> Dict[str, int]:
+    """
+    Line-by-line fallback for load_rankings, skipping lines without a valid rank.
+    
+    Args:
+        output_file: Path to the rankings file
+        
+    Returns:
+        Dictionary with filename as key and rank as value
+    """
+    rankings = {}
     
     try:
         with open(output_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    parts = line.split('\t')
-                    if len(parts) >= 1:
-                        filename = parts[0]
-                        try:
-                            rank = int(parts[1])
-                            rankings[filename] = rank
-                        except (ValueError, IndexError):
-                            continue
+            data = f.read()
+        for line in data.splitlines():
+            filename, sep, rest = line.strip().partition('\t')
+            if not sep:
+                continue
+            try:
+                rankings[filename] = int(rest.partition('\t')[0])
+            except ValueError:
+                continue
     except Exception as e:
         print(f"Error loading rankings: {e}")
     
     return rankings
 
 
+def open_journal(output_file: str):
+    """
+    Open the journal next to the rankings file for appending.
+    
+    Keeping the journal open avoids an open/close per rank change. It must be
+    closed before compact_rankings or save_rankings, which delete the journal.
+    
+    Args:
+        output_file: Path to the rankings file
+        
+    Returns:
+        File object opened in append mode
+    """
+    return open(get_journal_file(output_file), 'a', buffering=8192)
+
+
+def append_rank(output_file: str, filename: str, rank=None, journal=None):
+    """
+    Record a single rank change in the journal next to the rankings file.
+    
+    This is O(1) per call, unlike save_rankings which rewrites every line.
+    load_rankings replays the journal and compact_rankings folds it back
+    into the rankings file.
+    
+    Args:
+        output_file: Path to the rankings file
+        filename: Image whose rank changed
+        rank: New rank, or None if the rank was cleared
+        journal: Journal already opened with open_journal; if None it is opened for this entry only
+    """
+    entry = f"{filename}\t{'' if rank is None else rank}\n"
+    try:
+        if journal is not None:
+            journal.write(entry)
+            journal.flush()  # Hand the entry to the OS right away (no fsync)
+        else:
+            with open(get_journal_file(output_file), 'a') as f:
+                f.write(entry)
+    except Exception as e:
+        print(f"Error saving rank: {e}")
+
+
+def _write_lines_atomically(path: str, lines) -> None:
+    """
+    Write lines to a file via a temporary file and rename, so readers never see a partial file.
+    
+    Args:
+        path: Destination file path
+        lines: Iterable of strings (each including its newline)
+    """
+    tmp_path = str(path) + ".tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            f.writelines(lines)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def compact_rankings(output_file: str, rankings: Dict[str, int], jpg_files: List[str]) -> bool:
+    """
+    Rewrite the rankings file from the current rankings and discard the journal.
+    
+    Args:
+        output_file: Path to save rankings to (e.g., rankings.txt)
+        rankings: Dictionary with filename as key and rank as value
+        jpg_files: List of all jpg files in order
+        
+    Returns:
+        True if the rankings file was written
+    """
+    try:
+        # Save all files to rankings.txt, with unranked files written with an empty rank field
+        _write_lines_atomically(
+            output_file,
+            (f"{filename}\t{rankings.get(filename, '')}\n" for filename in jpg_files)
+        )
+    except Exception as e:
+        print(f"Error saving rankings: {e}")
+        return False
+    
+    # Everything in the journal is now in the rankings file
+    try:
+        os.remove(get_journal_file(output_file))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error removing rankings journal: {e}")
+    
+    return True
+
+
 def save_rankings(output_file: str, rankings: Dict[str, int], jpg_files: List[str], comments: Dict[str, str] = None):
     """
     Save rankings to a file and comments to a separate file.
@@ -109,32 +420,15 @@ def save_rankings(output_file: str, rankings: Dict[str, int], jpg_files: List[st
     if comments is None:
         comments = {}
     
-    try:
-        # Save all files to rankings.txt, with unranked files marked as empty or with placeholder
-        with open(output_file, 'w', buffering=1) as f:  # Line buffering for immediate writes
-            for filename in jpg_files:
-                if filename in rankings:
-                    rank = rankings[filename]
-                    f.write(f"{filename}\t{rank}\n")
-                else:
-                    # Write unranked files with empty rank field (or use a placeholder like "UNRANKED")
-                    f.write(f"{filename}\t\n")
-            f.flush()  # Explicit flush to ensure all data is written
-    except Exception as e:
-        print(f"Error saving rankings: {e}")
+    compact_rankings(output_file, rankings, jpg_files)
     
     # Save all files with comments to a separate file
     try:
         comments_file = output_file.replace('.txt', '_comments.txt')
-        with open(comments_file, 'w', buffering=1) as f:  # Line buffering for immediate writes
-            for filename in jpg_files:
-                if filename in rankings:
-                    rank = rankings[filename]
-                else:
-                    rank = ""
-                comment = comments.get(filename, "")
-                f.write(f"{filename}\t{rank}\t{comment}\n")
-            f.flush()  # Explicit flush to ensure all data is written
+        _write_lines_atomically(
+            comments_file,
+            (f"{filename}\t{rankings.get(filename, '')}\t{comments.get(filename, '')}\n" for filename in jpg_files)
+        )
     except Exception as e:
         print(f"Error saving comments: {e}")
 
@@ -176,6 +470,64 @@ def find_first_unranked(jpg_files: List[str], rankings: Dict[str, int]) -> int:
     return 0
 
 
+class UnrankedIndex:
+    """
+    Set of the indices of unranked images, stored as a ranked/unranked byte per image.
+    
+    Marking an image is O(1), and "next unranked" / "first unranked" queries search the
+    mask for a zero byte in C (memchr) instead of scanning every filename in Python.
+    The owner must call mark_ranked / mark_unranked whenever a rank is added or removed
+    so the index stays in sync with the rankings.
+    """
+    
+    def __init__(self, jpg_files: List[str], rankings: Dict[str, int]):
+        """
+        Build the index from the current rankings.
+        
+        Args:
+            jpg_files: List of all jpg files
+            rankings: Dictionary with filename as key and rank as value
+        """
+        self._ranked = bytearray(filename in rankings for filename in jpg_files)  # 1 = ranked, 0 = unranked
+        self._unranked_count = self._ranked.count(0)
+    
+    def __len__(self) -> int:
+        return self._unranked_count
+    
+    def mark_ranked(self, index: int):
+        """Remove an image index from the index (it now has a rank)"""
+        if not self._ranked[index]:
+            self._ranked[index] = 1
+            self._unranked_count -= 1
+    
+    def mark_unranked(self, index: int):
+        """Add an image index back to the index (its rank was cleared)"""
+        if self._ranked[index]:
+            self._ranked[index] = 0
+            self._unranked_count += 1
+    
+    def next_unranked(self, current_index: int) -> int:
+        """
+        Find the next unranked image starting from current_index.
+        
+        Args:
+            current_index: Starting index to search from
+            
+        Returns:
+            Index of next unranked image, or -1 if all are ranked
+        """
+        return self._ranked.find(0, max(current_index, 0))
+    
+    def first_unranked(self) -> int:
+        """
+        Find the first unranked image.
+        
+        Returns:
+            Index of first unranked image, or 0 if all are ranked
+        """
+        return max(self._ranked.find(0), 0)
+
+
 def is_valid_rank(rank_str: str, min_rank=0, max_rank=3, rank_map=None) -> Tuple[bool]:
     """
     Validate that the input is a valid rank from configured ranks.
@@ -366,15 +718,13 @@ def parse_radec_from_filename(filename: str) -> Optional[Tuple[float, float]]:
     Returns:
         Tuple of (ra_decimal, dec_decimal) as floats, or None if parsing fails
     """
-    import re
-    
-    name_without_ext = filename.rsplit('.', 1)[0]
+    dot = filename.rfind('.')
+    name_without_ext = filename[:dot] if dot != -1 else filename
     
     # Try sexagesimal format first (look for pattern: HHMMSS.SS+/-DDMMSS.SS)
     # This pattern handles coordinates like: 085925.43+074849.05 or 085925.43-074849.05
     # Coordinates can be anywhere in the filename, before/after other text
-    sexagesimal_pattern = r'(\d{2}\d{2}\d{2}(?:\.\d+)?)[+\-](\d{2}\d{2}\d{2}(?:\.\d+)?)'
-    sexagesimal_match = re.search(sexagesimal_pattern, name_without_ext)
+    sexagesimal_match = _SEXAGESIMAL_RE.search(name_without_ext)
     
     if sexagesimal_match:
         ra_str = sexagesimal_match.group(1)
@@ -390,12 +740,12 @@ def parse_radec_from_filename(filename: str) -> Optional[Tuple[float, float]]:
     
     # Try decimal degrees format: look for pattern like _XX.XX_±YY.YY
     # Can have any prefix/suffix around them
-    decimal_pattern = r'_(-?\d+\.?\d*)_(-?\d+\.?\d*)'
-    decimal_matches = list(re.finditer(decimal_pattern, name_without_ext))
+    # Use the last match (in case there are multiple coordinate-like patterns)
+    match = None
+    for match in _DECIMAL_RE.finditer(name_without_ext):
+        pass
     
-    if decimal_matches:
-        # Use the last match (in case there are multiple coordinate-like patterns)
-        match = decimal_matches[-1]
+    if match:
         try:
             ra = float(match.group(1))
             dec = float(match.group(2))
@@ -409,10 +759,33 @@ def parse_radec_from_filename(filename: str) -> Optional[Tuple[float, float]]:
     return None
 
 
+@functools.lru_cache(maxsize=8)
+def _read_config_file(config_path: str, mtime: float) -> Dict:
+    """
+    Read and parse a config file, memoized on its path and modification time
+    
+    The result is lru_cached and the same dictionary is returned to every caller that
+    loads an unchanged file, so callers must not mutate it (or any nested value); copy
+    it first if a modified configuration is needed.
+    
+    Args:
+        config_path: Path to the JSON config file
+        mtime: Modification time of the file; a changed file yields a new cache entry
+        
+    Returns:
+        Parsed configuration dictionary (shared between calls, do not mutate)
+    """
+    with open(config_path, 'rb') as f:
+        return _json_loads(f.read())
+
+
 def load_config(config_file: str = "config.json") -> Dict:
     """
     Load configuration from config.json
     
+    Parsed files are cached until they are modified, so the returned dictionary
+    is shared between calls and must not be mutated.
+    
     Args:
         config_file: Path to config.json file. If relative, searches in current dir, then in package directory
         
@@ -450,9 +823,7 @@ def load_config(config_file: str = "config.json") -> Dict:
     # Try current working directory first
     if os.path.exists(config_file):
         try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                return config
+            return _read_config_file(config_file, os.path.getmtime(config_file))
         except Exception as e:
             print(f"Error loading config from {config_file}: {e}")
             return default_config
@@ -463,9 +834,7 @@ def load_config(config_file: str = "config.json") -> Dict:
         package_config = os.path.join(package_dir, config_file)
         if os.path.exists(package_config):
             try:
-                with open(package_config, 'r') as f:
-                    config = json.load(f)
-                    return config
+                return _read_config_file(package_config, os.path.getmtime(package_config))
             except Exception as e:
                 print(f"Error loading config from {package_config}: {e}")
                 return default_config
@@ -473,7 +842,7 @@ def load_config(config_file: str = "config.json") -> Dict:
     return default_config
 
 
-def download_secondary_image(ra: float, dec: float, output_dir: str, config: Dict, filename: str = None, progress_callback=None) -> Optional[str]:
+def download_secondary_image(ra: float, dec: float, output_dir: str, config: Dict, filename: str = None, progress_callback=None, use_cache: bool = True) -> Optional[str]:
     """
     Download secondary image FITS file and create RGB composite JPG based on config
     
@@ -484,6 +853,7 @@ def download_secondary_image(ra: float, dec: float, output_dir: str, config: Dic
         config: Configuration dictionary with secondary_download section
         filename: Original filename to preserve coordinate format in output
         progress_callback: Optional callable that takes an int (0-100) for progress updates
+        use_cache: If True, reuse a FITS cutout downloaded in a previous session
         
     Returns:
         Path to generated RGB JPG image, or None if download failed
@@ -492,7 +862,7 @@ def download_secondary_image(ra: float, dec: float, output_dir: str, config: Dic
     from PIL import Image
     
     try:
-        from astropy.io import fits
+        import astropy.io.fits  # noqa: F401 - checked up front for a clear error; fetch_fits_data parses with it
     except ImportError:
         print("Error: astropy required for FITS processing. Install with: pip install astropy")
         return None
@@ -516,7 +886,7 @@ def download_secondary_image(ra: float, dec: float, output_dir: str, config: Dic
     if filename:
         # Check if original filename is in sexagesimal format by looking for the pattern
         # Sexagesimal format has HHMMSS.SS+/-DDMMSS.SS pattern
-        if re.search(r'\d{2}\d{2}\d{2}(?:\.\d+)?[+\-]\d{2}\d{2}\d{2}(?:\.\d+)?', filename):
+        if _SEXAGESIMAL_RE.search(filename):
             # Convert decimal back to sexagesimal for output filename
             ra_hms = decimal_to_sexagesimal_ra(ra)
             dec_dms = decimal_to_sexagesimal_dec(dec)
@@ -532,26 +902,10 @@ def download_secondary_image(ra: float, dec: float, output_dir: str, config: Dic
     try:
         emit_progress(10)  # 10% - starting download
         
-        # Download FITS file
-        response = requests.get(fits_url, timeout=30, stream=True)
-        response.raise_for_status()
-        
-        emit_progress(25)  # 25% - download complete
-        
-        # Save temporary FITS file
-        fits_path = Path(output_dir) / f"temp_{survey_name}_{ra}_{dec}.fits"
-        
-        with open(fits_path, 'wb') as f:
-            f.write(response.content)
-        
-        emit_progress(40)  # 40% - FITS file saved
+        # Download FITS file (or read it from the cache)
+        data = fetch_fits_data(fits_url, use_cache)
         
-        # Load FITS data
-        hdul = fits.open(fits_path)
-        data = hdul[0].data.astype(float)
-        hdul.close()
-        
-        emit_progress(50)  # 50% - FITS data loaded
+        emit_progress(50)  # 50% - FITS data downloaded and loaded
         
         # Get image dimensions (assume last two dims are spatial)
         if len(data.shape) == 3:
@@ -563,7 +917,6 @@ def download_secondary_image(ra: float, dec: float, output_dir: str, config: Dic
             data = np.expand_dims(data, axis=0)  # Add layer dimension
         else:
             print(f"Error: Unexpected FITS shape {data.shape}")
-            fits_path.unlink()
             return None
         
         # Apply asinh (inverse hyperbolic sine) scaling - better for astronomy
@@ -577,43 +930,47 @@ def download_secondary_image(ra: float, dec: float, output_dir: str, config: Dic
                 Q: Softening parameter (default 8.0). Higher Q = more contrast
             """
             if data.size == 0:
-                return np.zeros_like(data)
+                return np.zeros(data.shape, dtype=np.uint8)
             
-            # Remove NaNs
-            data_clean = np.where(np.isnan(data), 0, data)
+            # Remove NaNs, working in float32 throughout (ample precision for display)
+            data_clean = np.where(np.isnan(data), 0, data).astype(np.float32, copy=False)
             
             # Normalize to [0, 1] using percentiles for better handling of outliers
             flat = np.ravel(data_clean)
-            flat_sorted = np.sort(flat[flat > 0])  # Only look at positive values
+            # Only look at positive values; np.percentile partitions internally, so no full sort is needed
+            positive = flat[flat > 0]
             
-            if len(flat_sorted) == 0:
-                return np.zeros_like(data_clean)
+            if positive.size == 0:
+                return np.zeros(data.shape, dtype=np.uint8)
             
             # Use percentiles to set min/max
-            vmin = np.percentile(flat_sorted, 1)
-            vmax = np.percentile(flat_sorted, 99)
+            vmin, vmax = np.percentile(positive, [1, 99])
             
             if vmin == vmax:
-                vmin = flat_sorted.min()
-                vmax = flat_sorted.max()
+                vmin = positive.min()
+                vmax = positive.max()
             
-            # Normalize to [0, 1]
-            normalized = (data_clean - vmin) / (vmax - vmin)
-            normalized = np.clip(normalized, 0, 1)
+            # Normalize to [0, 1] in place; scalars are cast to float32 so nothing is promoted to float64
+            normalized = data_clean
+            normalized -= np.float32(vmin)
+            normalized /= np.float32(vmax - vmin)
+            np.clip(normalized, 0, 1, out=normalized)
             
             # Apply asinh scaling: this compresses bright sources while preserving faint detail
             # asinh(Q * x) / asinh(Q) maps [0, 1] -> [0, 1] with non-linear stretching
-            scaled = np.arcsinh(Q * normalized) / np.arcsinh(Q)
-            scaled = np.clip(scaled, 0, 1)
+            scaled = normalized
+            scaled *= np.float32(Q)
+            np.arcsinh(scaled, out=scaled)
+            scaled /= np.float32(np.arcsinh(Q))
+            np.clip(scaled, 0, 1, out=scaled)
             
-            return (scaled * 255).astype(np.uint8)
-        
-        # Create RGB image based on extension mapping
-        rgb = np.zeros((height, width, 3), dtype=np.uint8)
+            scaled *= 255
+            return scaled.astype(np.uint8)
         
         emit_progress(60)  # 60% - starting composite creation
         
         # Map each layer to RGB channels according to config
+        channel_data = {}
         for layer_idx_str, channels in extensions_mapping.items():
             layer_idx = int(layer_idx_str)
             if layer_idx < n_layers:
@@ -622,29 +979,25 @@ def download_secondary_image(ra: float, dec: float, output_dir: str, config: Dic
                 if isinstance(channels, str):
                     channels = [channels]
                 for channel in channels:
-                    if channel == "R":
-                        rgb[:, :, 0] = scaled
-                    elif channel == "G":
-                        rgb[:, :, 1] = scaled
-                    elif channel == "B":
-                        rgb[:, :, 2] = scaled
+                    channel_data[channel] = scaled
         
-        emit_progress(75)  # 75% - composite created
+        # Stack the channels in one pass (unmapped channels stay black), flipping each
+        # vertically (across y-axis) for correct orientation as part of the same copy
+        blank = np.zeros((height, width), dtype=np.uint8)
+        rgb = np.stack([channel_data.get(channel, blank)[::-1] for channel in ("R", "G", "B")], axis=-1)
         
-        # Flip image vertically (across y-axis) for correct orientation
-        rgb = np.flipud(rgb)
+        emit_progress(75)  # 75% - composite created
         
         # Convert to PIL Image and save as JPG
         image = Image.fromarray(rgb, mode='RGB')
-        output_path = Path(output_dir) / f"{survey_name}_{coord_str}.jpg"
-        image.save(output_path, quality=90)
+        output_path = os.path.join(output_dir, f"{survey_name}_{coord_str}.jpg")
+        # Explicit encoder options: skip the extra Huffman optimization / progressive passes, 4:2:0 chroma
+        image.save(output_path, 'JPEG', quality=90, optimize=False, progressive=False, subsampling=2)
         
         emit_progress(90)  # 90% - JPG saved
-        # Clean up temporary FITS file
-        fits_path.unlink()
         
         emit_progress(100)  # 100% - complete
-        return str(output_path)
+        return output_path
     
     except Exception as e:
         print(f"Error downloading/processing secondary image: {e}")
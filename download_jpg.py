@@ -6,27 +6,74 @@ By default reads RA and DEC from CSV file (columns 0 and 1), downloads DECaLS im
 applies asinh scaling, and creates RGB JPEGs.
 
 Usage:
-    python download_jpg.py <csv_file> [output_dir] [--prefix PREFIX] [--skip-first-column]
+    python download_jpg.py <csv_file> [<csv_file> ...] [-o OUTPUT_DIR] [--prefix PREFIX] [--skip-first-column]
+                           [--no-cache] [--workers N] [--force]
 
 Arguments:
-    csv_file: Path to CSV file with source data
-    output_dir: Directory to save RGB JPEGs (default: examples/)
+    csv_file: Path to one or more CSV files with source data
+    -o, --output-dir: Directory to save RGB JPEGs (default: examples/)
     --prefix: Prefix for output filenames (default: download_)
     --skip-first-column: If set, uses columns 1 and 2 as RA and DEC (skips column 0 which may be the object ID)
+    --no-cache: If set, always re-download FITS cutouts instead of using ~/.cache/astrorank
+    --workers: Number of sources processed in parallel (default: number of CPUs, at most 5)
+    --force: If set, re-create JPEGs that already exist in output_dir instead of skipping them
+
+The legacy form `python download_jpg.py data.csv examples/` is still accepted: when no
+--output-dir is given, a trailing argument that is not a CSV file is used as the output directory.
 
 Examples:
-    python download_jpg.py data.csv examples/ --prefix decals_
-    python download_jpg.py wslq_redshifts.csv examples/ --prefix decals_ --skip-first-column
+    python download_jpg.py data.csv -o examples/ --prefix decals_
+    python download_jpg.py wslq_redshifts.csv -o examples/ --prefix decals_ --skip-first-column
+    python download_jpg.py catalogs/*.csv -o examples/
 """
 
+import os
 import sys
 import csv
+import argparse
 from pathlib import Path
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import numpy as np
-from astropy.io import fits
 from PIL import Image
-import urllib.request
-import urllib.error
+import requests
+from requests.adapters import HTTPAdapter
+
+from astrorank.utils import fetch_fits_data
+
+
+# Bands downloaded for each source
+BANDS = ('g', 'r', 'z')
+
+# Upper bound on concurrent HTTP requests to the Legacy Survey service
+MAX_CONCURRENT_REQUESTS = 16
+
+# Sources processed in parallel by default; each one downloads all BANDS concurrently
+DEFAULT_WORKERS = max(1, min(os.cpu_count() or 1, MAX_CONCURRENT_REQUESTS // len(BANDS)))
+
+# Per-process HTTP session (created lazily) so TCP/TLS connections are reused across bands and rows
+_session = None
+_session_pid = None
+
+
+def get_session():
+    """
+    Return this process's HTTP session, creating it on first use.
+    
+    Worker processes never reuse a session inherited from their parent, since
+    its pooled connections cannot be shared across processes.
+    
+    Returns:
+        requests.Session with a connection pool large enough for concurrent band downloads
+    """
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        _session_pid = os.getpid()
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
 
 
 def apply_asinh_scaling(data, Q=8.0):
@@ -41,40 +88,72 @@ def apply_asinh_scaling(data, Q=8.0):
     Returns:
         Scaled image data as uint8 (0-255)
     """
-    if data.size == 0:
-        return np.zeros_like(data)
-    
-    # Remove NaNs
-    data_clean = np.where(np.isnan(data), 0, data)
+    return apply_asinh_scaling_batched(np.asarray(data)[np.newaxis], Q)[0]
+
+
+def apply_asinh_scaling_batched(bands, Q=8.0):
+    """
+    Apply asinh scaling to a stack of bands in one vectorized pass.
     
-    # Normalize to [0, 1] using percentiles for better handling of outliers
-    flat = np.ravel(data_clean)
-    flat_sorted = np.sort(flat[flat > 0])  # Only look at positive values
+    Each band gets its own percentile-based limits, but the normalization and
+    asinh stretch run once over the whole stack instead of once per band.
     
-    if len(flat_sorted) == 0:
-        return np.zeros_like(data_clean)
+    Args:
+        bands: Image data with shape (n_bands, height, width)
+        Q: Softening parameter (default 8.0). Higher Q = more contrast
+        
+    Returns:
+        Scaled image data as uint8 (0-255) with the same shape as bands
+    """
+    if bands.size == 0:
+        return np.zeros(bands.shape, dtype=np.uint8)
     
-    # Use percentiles to set min/max
-    vmin = np.percentile(flat_sorted, 1)
-    vmax = np.percentile(flat_sorted, 99)
+    # Remove NaNs, working in float32 throughout (ample precision for display)
+    data_clean = np.where(np.isnan(bands), 0, bands).astype(np.float32, copy=False)
     
-    if vmin == vmax:
-        vmin = flat_sorted.min()
-        vmax = flat_sorted.max()
+    # Per-band limits: percentiles for better handling of outliers.
+    # Bands without positive values keep vmin=0, span=1, which maps them to black.
+    n_bands = data_clean.shape[0]
+    vmin = np.zeros(n_bands, dtype=np.float32)
+    span = np.ones(n_bands, dtype=np.float32)
+    for i in range(n_bands):
+        flat = np.ravel(data_clean[i])
+        # Only look at positive values; np.percentile partitions internally, so no full sort is needed
+        positive = flat[flat > 0]
+        
+        if positive.size == 0:
+            continue
+        
+        # Use percentiles to set min/max
+        low, high = np.percentile(positive, [1, 99])
+        
+        if low == high:
+            low = positive.min()
+            high = positive.max()
+        
+        vmin[i] = low
+        if high > low:
+            span[i] = high - low
     
-    # Normalize to [0, 1]
-    normalized = (data_clean - vmin) / (vmax - vmin)
-    normalized = np.clip(normalized, 0, 1)
+    # Normalize every band to [0, 1] in place, broadcasting the per-band limits
+    normalized = data_clean
+    normalized -= vmin[:, np.newaxis, np.newaxis]
+    normalized /= span[:, np.newaxis, np.newaxis]
+    np.clip(normalized, 0, 1, out=normalized)
     
     # Apply asinh scaling: meant to remove make bright sources matter less while preserving faint detail
     # asinh(Q * x) / asinh(Q) maps [0, 1] -> [0, 1] with non-linear stretching
-    scaled = np.arcsinh(Q * normalized) / np.arcsinh(Q)
-    scaled = np.clip(scaled, 0, 1)
+    scaled = normalized
+    scaled *= np.float32(Q)
+    np.arcsinh(scaled, out=scaled)
+    scaled /= np.float32(np.arcsinh(Q))
+    np.clip(scaled, 0, 1, out=scaled)
     
-    return (scaled * 255).astype(np.uint8)
+    scaled *= 255
+    return scaled.astype(np.uint8)
 
 
-def download_decals_image(ra, dec, band, size=512):
+def download_decals_image(ra, dec, band, size=512, use_cache=True):
     """
     Download a single DECaLS image from the web API.
     
@@ -83,6 +162,7 @@ def download_decals_image(ra, dec, band, size=512):
         dec: Declination in degrees
         band: Filter band ('g', 'r', or 'z')
         size: Image size in pixels (default 512)
+        use_cache: If True, reuse a previously downloaded cutout from the cache
         
     Returns:
         FITS data as numpy array, or None if download failed
@@ -90,13 +170,8 @@ def download_decals_image(ra, dec, band, size=512):
     url = f"http://legacysurvey.org/viewer/fits-cutout?ra={ra}&dec={dec}&layer=ls-dr10&size={size}&pixscale=0.263672&bands={band}"
     
     try:
-        print(f"  Downloading {band}-band")
-        with urllib.request.urlopen(url, timeout=30) as response:
-            fits_data = fits.open(response)
-            data = fits_data[0].data.astype(np.float32)
-            fits_data.close()
-            return data
-    except (urllib.error.URLError, urllib.error.HTTPError, Exception) as e:
+        return fetch_fits_data(url, use_cache, get_session())
+    except Exception as e:
         print(f"  ERROR: Failed to download {band}-band at RA={ra}, DEC={dec}: {e}")
         return None
 
@@ -116,33 +191,178 @@ def create_rgb_image(g_data, r_data, z_data):
     Returns:
         RGB image as uint8 numpy array (height, width, 3)
     """
-    # Get dimensions
-    height, width = g_data.shape
+    # Stack the bands in channel order and scale them together
+    # z -> Red, r -> Green, g -> Blue
+    bands = np.stack([z_data, r_data, g_data], axis=0)
+    scaled = apply_asinh_scaling_batched(bands)
     
-    # Create RGB image
-    rgb = np.zeros((height, width, 3), dtype=np.uint8)
+    # Move the band axis last to get (height, width, 3) and flip vertically so
+    # bottom-left becomes top-left; both are views, materialized in a single copy
+    return np.ascontiguousarray(scaled[:, ::-1].transpose(1, 2, 0))
+
+
+def fetch_bands(executor, ra, dec, use_cache=True):
+    """
+    Start downloading all bands for a source in the background.
     
-    # Apply asinh scaling and assign to channels
-    # z -> Red, r -> Green, g -> Blue
-    rgb[:, :, 0] = apply_asinh_scaling(z_data)  # Red channel
-    rgb[:, :, 1] = apply_asinh_scaling(r_data)  # Green channel
-    rgb[:, :, 2] = apply_asinh_scaling(g_data)  # Blue channel
+    Args:
+        executor: ThreadPoolExecutor to run the downloads on
+        ra: Right ascension in degrees
+        dec: Declination in degrees
+        use_cache: If True, reuse previously downloaded cutouts from the cache
+        
+    Returns:
+        List of futures resolving to the band data, in BANDS order
+    """
+    return [executor.submit(download_decals_image, ra, dec, band, use_cache=use_cache) for band in BANDS]
+
+
+def read_sources(csv_path, skip_first_column=False):
+    """
+    Read source names and coordinates from a CSV file.
+    
+    RA/DEC of all rows are converted to floats in one numpy call. If any row is malformed,
+    parsing falls back to converting row by row so the bad rows can be reported and skipped.
+    
+    Args:
+        csv_path: Path to CSV file with source data
+        skip_first_column: If True, use columns 1,2 as RA,DEC and column 0 as the source name
+        
+    Returns:
+        List of (source_name, ra, dec) tuples; rows that cannot be parsed are skipped
+    """
+    with open(csv_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)  # Skip header
+        print(f"Header: {header}")
+        rows = list(reader)
     
-    # Flip vertically so bottom-left becomes top-left
-    rgb = np.flipud(rgb)
+    # Determine column indices
+    if skip_first_column:
+        # Skip first column (ID), use columns 1 and 2 as RA and DEC, column 0 as name
+        ra_col, dec_col, name_col = 1, 2, 0
+    else:
+        # Default: use columns 0 and 1 as RA and DEC, no name column
+        ra_col, dec_col, name_col = 0, 1, None
     
-    return rgb
+    try:
+        coords = np.array([(row[ra_col], row[dec_col]) for row in rows], dtype=np.float64).reshape(-1, 2)
+    except (ValueError, IndexError):
+        return _read_sources_by_row(rows, ra_col, dec_col, name_col)
+    
+    if name_col is not None:
+        names = [row[name_col].strip() for row in rows]
+    else:
+        # Use the row index to generate a generic name
+        names = [f"source_{row_idx}" for row_idx in range(len(rows))]
+    
+    return list(zip(names, coords[:, 0].tolist(), coords[:, 1].tolist()))
+
+
+def _read_sources_by_row(rows, ra_col, dec_col, name_col):
+    """
+    Row-by-row fallback for read_sources, used when the CSV contains malformed rows.
+    
+    Args:
+        rows: CSV rows (lists of strings) after the header
+        ra_col: Column index of RA
+        dec_col: Column index of DEC
+        name_col: Column index of the source name, or None to generate names
+        
+    Returns:
+        List of (source_name, ra, dec) tuples for the rows that could be parsed
+    """
+    sources = []
+    
+    for row_idx, row in enumerate(rows):
+        try:
+            # Generate source name
+            if name_col is not None and name_col < len(row):
+                source_name = row[name_col].strip()
+            else:
+                # Use RA and DEC to generate a generic name
+                source_name = f"source_{row_idx}"
+            
+            ra = float(row[ra_col])
+            dec = float(row[dec_col])
+        except (ValueError, IndexError) as e:
+            print(f"  ERROR: Could not parse row {row_idx}: {e}")
+            continue
+        
+        sources.append((source_name, ra, dec))
+    
+    return sources
+
+
+def process_source(source, output_dir, prefix="download_", use_cache=True, force=False):
+    """
+    Download, scale and save the RGB JPEG for a single source.
+    
+    Runs in a worker process; all bands of the source are downloaded concurrently.
+    
+    Args:
+        source: (source_name, ra, dec) tuple
+        output_dir: Directory to save the RGB JPEG
+        prefix: Prefix for the output filename
+        use_cache: If True, reuse FITS cutouts cached by previous runs
+        force: If True, re-create the JPEG even if it already exists
+        
+    Returns:
+        Path of the saved (or already existing) JPEG as a string, or None if the source failed
+    """
+    source_name, ra, dec = source
+    output_file = os.path.join(output_dir, f"{prefix}{source_name}_{ra:.4f}_{dec:.4f}.jpg")
+    
+    # Resume fast path: a non-empty JPEG from a previous run needs no downloads
+    if not force:
+        try:
+            if os.stat(output_file).st_size > 0:
+                print(f"\nSkipping: {source_name} (exists: {output_file})")
+                return output_file
+        except OSError:
+            pass
+    
+    print(f"\nProcessing: {source_name} (RA={ra}, DEC={dec})")
+    
+    try:
+        with ThreadPoolExecutor(max_workers=len(BANDS)) as executor:
+            g_data, r_data, z_data = [future.result() for future in fetch_bands(executor, ra, dec, use_cache)]
+        
+        if g_data is None or r_data is None or z_data is None:
+            print(f"  WARNING: Could not download all bands for {source_name}")
+            return None
+        
+        # Create RGB image
+        rgb_image = create_rgb_image(g_data, r_data, z_data)
+        
+        # Save as JPEG
+        pil_image = Image.fromarray(rgb_image, mode='RGB')
+        # Explicit encoder options: skip the extra Huffman optimization / progressive passes, 4:2:0 chroma
+        pil_image.save(output_file, 'JPEG', quality=95, optimize=False, progressive=False, subsampling=2)
+        print(f"  Saved: {output_file}")
+        return output_file
+    except Exception as e:
+        print(f"  ERROR: Failed to process {source_name}: {e}")
+        return None
 
 
-def process_sources(csv_file, output_dir="examples/", prefix="download_", skip_first_column=False):
+def process_sources(csv_file, output_dir="examples/", prefix="download_", skip_first_column=False, use_cache=True,
+                    workers=DEFAULT_WORKERS, force=False):
     """
     Read CSV file and download/process DECaLS images for each source.
     
+    Sources are independent, so they are processed in parallel worker processes
+    (downloads plus the CPU-bound scaling and JPEG encoding). With each source
+    fetching its bands concurrently, at most workers * len(BANDS) requests are in flight.
+    
     Args:
         csv_file: Path to CSV file with source data
         output_dir: Directory to save RGB JPEGs
         prefix: Prefix for output filenames (default: download_)
         skip_first_column: If True, use columns 1,2 as RA,DEC instead of 0,1
+        use_cache: If True, reuse FITS cutouts cached by previous runs
+        workers: Number of sources processed in parallel (1 = process sequentially in this process)
+        force: If True, re-create JPEGs that already exist in output_dir
     """
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -153,91 +373,70 @@ def process_sources(csv_file, output_dir="examples/", prefix="download_", skip_f
         return False
     
     print(f"Reading sources from {csv_file}")
+    sources = read_sources(csv_path, skip_first_column)
+    if not sources:
+        return True
     
-    with open(csv_path, 'r') as f:
-        reader = csv.reader(f)
-        header = next(reader)  # Skip header
-        print(f"Header: {header}")
+    process = partial(process_source, output_dir=os.fspath(output_path), prefix=prefix, use_cache=use_cache,
+                      force=force)
+    
+    if workers <= 1:
+        results = [process(source) for source in sources]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(process, sources))
+    
+    saved = sum(result is not None for result in results)
+    print(f"\nDone: {saved} of {len(sources)} sources have a JPEG in {output_path}")
+    
+    return True
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Argument list (default: sys.argv[1:])
         
-        # Determine column indices
-        if skip_first_column:
-            # Skip first column (ID), use columns 1 and 2 as RA and DEC, column 0 as name
-            ra_col, dec_col, name_col = 1, 2, 0
+    Returns:
+        argparse.Namespace with csv_files, output_dir, prefix, skip_first_column, no_cache, workers and force
+    """
+    parser = argparse.ArgumentParser(
+        description="Download DECaLS g, r, z images for sources in CSV files and create RGB JPGs."
+    )
+    parser.add_argument("csv_files", nargs="+", metavar="csv_file",
+                        help="CSV file(s) with source data")
+    parser.add_argument("-o", "--output-dir", default=None,
+                        help="Directory to save RGB JPEGs (default: examples/)")
+    parser.add_argument("--prefix", default="download_",
+                        help="Prefix for output filenames (default: download_)")
+    parser.add_argument("--skip-first-column", action="store_true",
+                        help="Use columns 1 and 2 as RA and DEC (column 0 is the object ID)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-download FITS cutouts instead of using ~/.cache/astrorank")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of sources processed in parallel (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-create JPEGs that already exist in the output directory")
+    args = parser.parse_args(argv)
+    
+    # Legacy form: `download_jpg.py data.csv examples/` with the output directory as a positional argument
+    if args.output_dir is None:
+        last = args.csv_files[-1]
+        if len(args.csv_files) > 1 and not (last.lower().endswith(".csv") or os.path.isfile(last)):
+            args.output_dir = args.csv_files.pop()
         else:
-            # Default: use columns 0 and 1 as RA and DEC, no name column
-            ra_col, dec_col, name_col = 0, 1, None
-        
-        for row_idx, row in enumerate(reader):
-            try:
-                # Generate source name
-                if name_col is not None and name_col < len(row):
-                    source_name = row[name_col].strip()
-                else:
-                    # Use RA and DEC to generate a generic name
-                    source_name = f"source_{row_idx}"
-                
-                ra = float(row[ra_col])
-                dec = float(row[dec_col])
-                
-                print(f"\nProcessing: {source_name} (RA={ra}, DEC={dec})")
-                
-                # Download images
-                g_data = download_decals_image(ra, dec, 'g')
-                r_data = download_decals_image(ra, dec, 'r')
-                z_data = download_decals_image(ra, dec, 'z')
-                
-                if g_data is None or r_data is None or z_data is None:
-                    print(f"  WARNING: Could not download all bands for {source_name}")
-                    continue
-                
-                # Create RGB image
-                rgb_image = create_rgb_image(g_data, r_data, z_data)
-                
-                # Save as JPEG
-                output_file = output_path / f"{prefix}{source_name}_{ra:.4f}_{dec:.4f}.jpg"
-                pil_image = Image.fromarray(rgb_image, mode='RGB')
-                pil_image.save(output_file, 'JPEG', quality=95)
-                print(f"  Saved: {output_file}")
-                
-            except (ValueError, IndexError) as e:
-                print(f"  ERROR: Could not parse row {row_idx}: {e}")
-                continue
+            args.output_dir = "examples/"
     
-    return True
+    return args
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python download_jpg.py <csv_file> [output_dir] [--prefix PREFIX] [--skip-first-column]")
-        print("\nExamples:")
-        print("  python download_jpg.py data.csv")
-        print("  python download_jpg.py data.csv examples/ --prefix decals_")
-        print("  python download_jpg.py wslq_redshifts.csv examples/ --prefix decals_ --skip-first-column")
-        sys.exit(1)
-    
-    csv_file = sys.argv[1]
-    output_dir = "examples/"
-    prefix = "download_"
-    skip_first_column = False
-    
-    # Parse optional arguments
-    i = 2
-    while i < len(sys.argv):
-        if sys.argv[i] == "--prefix":
-            if i + 1 < len(sys.argv):
-                prefix = sys.argv[i + 1]
-                i += 2
-            else:
-                i += 1
-        elif sys.argv[i] == "--skip-first-column":
-            skip_first_column = True
-            i += 1
-        elif not sys.argv[i].startswith("--"):
-            # Non-flag argument is output_dir
-            output_dir = sys.argv[i]
-            i += 1
-        else:
-            i += 1
+    args = parse_args()
     
-    success = process_sources(csv_file, output_dir, prefix, skip_first_column)
+    success = True
+    for csv_file in args.csv_files:
+        success &= process_sources(csv_file, args.output_dir, args.prefix, args.skip_first_column,
+                                   not args.no_cache, args.workers, args.force)
     sys.exit(0 if success else 1)